@@ -0,0 +1,296 @@
+"""Load test: N concurrent Streamlit sessions clicking through the app's pages.
+
+Every session is an in-process AppTest of main.py. Data is preloaded from a
+local FRED stand-in (FREDStubServer) into a temporary cache directory, so
+sessions share the process-wide store and caches the way sessions of one
+server process do; the background refresh scheduler is off so it does not
+skew the measurements. Run from the repository root:
+
+    python -m benchmarks.load_test --sessions 8 --rounds 3 --output load.json
+    python -m benchmarks.load_test --sessions 8 --isolation process
+
+Reported per session and overall: p50/p95/p99 rerun latency, CPU time of
+the script thread and peak RSS. With --isolation thread (the default) all
+sessions share one process, as on a real server, and peak RSS is that of
+the whole process; --isolation process runs each session in its own
+process, which gives per-session memory but no shared caches.
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def session_script(main_path: str):
+    """AppTest script: run main.py and record the CPU time of this script thread"""
+    import runpy
+    import time
+    import streamlit as st
+
+    start = time.thread_time()
+    try:
+        runpy.run_path(main_path, run_name='__main__')
+    finally:
+        st.session_state['_load_test_cpu'] = time.thread_time() - start
+
+
+def configure_app(base_url: str):
+    """Point this process's app at the FRED stand-in and turn off the background scheduler.
+
+    Passed to process workers as their initializer: under the spawn start
+    method (macOS, Windows) they do not inherit the parent's settings and
+    would otherwise call the real API. The scheduler is off so its thread
+    does not compete with the sessions being measured.
+    """
+    from config.settings import FRED_CONFIG, REFRESH_CONFIG
+
+    FRED_CONFIG['base_url'] = base_url
+    REFRESH_CONFIG['enabled'] = False
+
+
+@contextmanager
+def app_config(base_url: str):
+    """`configure_app` for the duration of the block"""
+    from config.settings import FRED_CONFIG, REFRESH_CONFIG
+
+    saved = FRED_CONFIG['base_url'], REFRESH_CONFIG['enabled']
+    configure_app(base_url)
+    try:
+        yield
+    finally:
+        FRED_CONFIG['base_url'], REFRESH_CONFIG['enabled'] = saved
+
+
+@contextmanager
+def shared_runtime():
+    """Give every AppTest session in this process one mock Runtime, as sessions of one server share theirs.
+
+    AppTest installs a mock Runtime singleton for each run and clears it
+    when the run ends, so concurrent sessions would remove it from under
+    each other. This replaces Runtime.instance/exists, which are Streamlit
+    internals (checked against 1.41), until the block exits.
+    """
+    from unittest.mock import MagicMock
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    if 'instance' not in Runtime.__dict__ or 'exists' not in Runtime.__dict__:
+        raise RuntimeError("This Streamlit version's Runtime cannot be shared; use --isolation process")
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    saved = Runtime.__dict__['instance'], Runtime.__dict__['exists']
+    Runtime.instance = classmethod(lambda cls: runtime)
+    Runtime.exists = classmethod(lambda cls: True)
+    try:
+        yield
+    finally:
+        Runtime.instance, Runtime.exists = saved
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 1e6
+
+
+def click_path(categories: List[str]) -> List[tuple]:
+    """One round of clicks: every viewer category, every dashboard category, the backtest"""
+    steps = [('radio', 'viewer_category', category) for category in categories[1:]]
+    steps.append(('page', 'Dashboard'))
+    steps += [('radio', 'dashboard_category', category) for category in categories[1:]]
+    steps.append(('page', 'Backtest'))
+    steps.append(('page', 'Data Viewer'))
+    return steps
+
+
+def run_session(session: int, rounds: int, think_time: float, timeout: float,
+                categories: List[str], barrier=None) -> Dict:
+    """Drive one session through `rounds` of the click path; returns its samples"""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_function(
+        session_script, args=(os.path.join(ROOT, 'main.py'),), default_timeout=timeout
+    )
+    samples = []
+    errors = []
+
+    def rerun(label: str):
+        start = time.perf_counter()
+        app.run()
+        latency = time.perf_counter() - start
+        samples.append({
+            'step': label,
+            'latency': latency,
+            'cpu': float(app.session_state['_load_test_cpu']) if '_load_test_cpu' in app.session_state else np.nan
+        })
+        errors.extend(f"{label}: {exception.value}" for exception in app.exception)
+        if think_time:
+            time.sleep(think_time)
+
+    if barrier is not None:
+        barrier.wait()
+    rerun('initial')
+    for _ in range(rounds):
+        for step in click_path(categories):
+            if step[0] == 'page':
+                app.sidebar.radio[0].set_value(step[1])
+            else:
+                widget = app.radio(key=step[1])
+                widget.set_value(step[2])
+            rerun(f"{step[0]}:{step[-1]}")
+
+    return {'session': session, 'samples': samples, 'errors': errors, 'peak_rss_mb': peak_rss_mb()}
+
+
+def latency_summary(latencies) -> Dict[str, float]:
+    latencies = np.asarray(latencies, dtype=float)
+    if not latencies.size:
+        return {}
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        'reruns': int(latencies.size),
+        'p50': float(p50),
+        'p95': float(p95),
+        'p99': float(p99),
+        'max': float(latencies.max())
+    }
+
+
+def preload(years: int, latency: float):
+    """Start the FRED stand-in and fill the cache and shared store from it"""
+    from benchmarks.suite import synthetic_series
+    from config.settings import FRED_CONFIG
+    from data.fred_stub import FREDStubServer
+    from engine.batch import BatchEngine
+
+    series_ids = [series_id for series_dict in FRED_CONFIG['series'].values() for series_id in series_dict]
+    server = FREDStubServer(synthetic_series(series_ids, years, 'native'), latency=latency).start()
+    BatchEngine(base_url=server.base_url).run(['refresh', 'signals'])
+    return server
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=4)
+    parser.add_argument('--rounds', type=int, default=2, help="Passes over the click path per session")
+    parser.add_argument('--think-time', type=float, default=0.0, help="Seconds between clicks")
+    parser.add_argument('--isolation', choices=['thread', 'process'], default='thread')
+    parser.add_argument('--years', type=int, default=30, help="History length of the synthetic series")
+    parser.add_argument('--latency', type=float, default=0.0, help="Stub response delay in seconds")
+    parser.add_argument('--timeout', type=float, default=120, help="Seconds allowed per rerun")
+    parser.add_argument('--output', help="Write the results JSON here (default: stdout)")
+    args = parser.parse_args()
+    if args.output:
+        args.output = os.path.abspath(args.output)
+
+    # The app's caches and snapshot are relative paths; keep them out of the working tree
+    workdir = tempfile.mkdtemp(prefix='load-test-')
+    os.chdir(workdir)
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+    from config.settings import FRED_CONFIG
+    server = preload(args.years, args.latency)
+    categories = list(FRED_CONFIG['series'])
+
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        if args.isolation == 'thread':
+            barrier = threading.Barrier(args.sessions)
+            with app_config(server.base_url), shared_runtime(), \
+                    ThreadPoolExecutor(max_workers=args.sessions) as executor:
+                futures = [
+                    executor.submit(run_session, session, args.rounds, args.think_time,
+                                    args.timeout, categories, barrier)
+                    for session in range(args.sessions)
+                ]
+                sessions = [future.result() for future in futures]
+        else:
+            with ProcessPoolExecutor(max_workers=args.sessions, initializer=configure_app,
+                                     initargs=(server.base_url,)) as executor:
+                futures = [
+                    executor.submit(run_session, session, args.rounds, args.think_time,
+                                    args.timeout, categories)
+                    for session in range(args.sessions)
+                ]
+                sessions = [future.result() for future in futures]
+    finally:
+        server.stop()
+        os.chdir(ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+    elapsed = time.perf_counter() - start
+
+    all_latencies = [sample['latency'] for session in sessions for sample in session['samples']]
+    report = {
+        'parameters': {
+            'sessions': args.sessions,
+            'rounds': args.rounds,
+            'think_time': args.think_time,
+            'isolation': args.isolation,
+            'years': args.years,
+            'latency': args.latency
+        },
+        'overall': dict(
+            latency_summary(all_latencies),
+            wall_seconds=elapsed,
+            reruns_per_second=len(all_latencies) / elapsed,
+            # Process CPU covers every thread; in process isolation it is the parent only
+            process_cpu_seconds=time.process_time() - cpu_start,
+            peak_rss_mb=max(session['peak_rss_mb'] for session in sessions),
+            errors=sum(len(session['errors']) for session in sessions)
+        ),
+        'sessions': [
+            dict(
+                latency_summary([sample['latency'] for sample in session['samples']]),
+                session=session['session'],
+                cpu_seconds=float(np.nansum([sample['cpu'] for sample in session['samples']])),
+                peak_rss_mb=session['peak_rss_mb'],
+                errors=session['errors']
+            )
+            for session in sessions
+        ],
+        'steps': {
+            step: latency_summary([
+                sample['latency'] for session in sessions
+                for sample in session['samples'] if sample['step'] == step
+            ])
+            for step in dict.fromkeys(sample['step'] for sample in sessions[0]['samples'])
+        }
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as handle:
+            handle.write(text)
+    else:
+        print(text)
+
+    overall = report['overall']
+    print(
+        f"{args.sessions} sessions, {overall['reruns']} reruns in {elapsed:.1f} s: "
+        f"p50 {overall['p50'] * 1000:.0f} ms, p95 {overall['p95'] * 1000:.0f} ms, "
+        f"p99 {overall['p99'] * 1000:.0f} ms, peak RSS {overall['peak_rss_mb']:.0f} MB, "
+        f"{overall['errors']} errors",
+        file=sys.stderr
+    )
+    return 1 if overall['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""Benchmark suite over synthetic FRED data served by a local stand-in server.
+
+Run from the repository root:
+    python -m benchmarks.suite --years 30 --frequency native --latency 0.02 --output bench.json
+    python -m benchmarks.suite --compare bench.json   # exit 1 on slowdowns beyond --threshold
+
+Every benchmark reports the min, median and mean of `--repeat` runs in
+seconds; results are written as JSON together with the run parameters and
+library versions so runs can be compared.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import traceback
+from typing import Callable, Dict, Optional
+import numpy as np
+import pandas as pd
+import requests
+from config.settings import FRED_CONFIG, STORE_CONFIG
+from data.data_processor import FinancialDataProcessor
+from data.fred_api import FREDReader
+from data.fred_parser import parse_observations
+from data.fred_stub import FREDStubServer
+from data.rate_limit import TokenBucket
+from data.series_store import SeriesStore
+from models.dcf_model import DCFModel
+from models.signals import compute_signals
+
+# With --frequency native these are served daily and weekly, everything else monthly
+DAILY_SERIES = {'DGS2', 'DGS10', 'DGS20'}
+WEEKLY_SERIES = {'CCSA'}
+
+
+def synthetic_series(series_ids, years: int, frequency: str, seed: int = 0) -> Dict[str, pd.Series]:
+    """Random-walk series ending at the last full year; `frequency` is a pandas alias or 'native'"""
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp('2024-12-31')
+    start = end - pd.DateOffset(years=years) + pd.Timedelta(days=1)
+    series = {}
+    for series_id in series_ids:
+        freq = frequency
+        if frequency == 'native':
+            freq = 'B' if series_id in DAILY_SERIES else 'W-SAT' if series_id in WEEKLY_SERIES else 'MS'
+        index = pd.date_range(start, end, freq=freq)
+        series[series_id] = pd.Series(
+            100 + rng.standard_normal(len(index)).cumsum(), index=index
+        ).round(3)
+    return series
+
+
+def profit_history(years: int, seed: int = 0) -> pd.DataFrame:
+    """Quarterly corporate profits in the layout DCFEngine expects"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(end='2024-12-31', periods=years * 4, freq='QE')
+    before_tax = 1000 * np.cumprod(1 + rng.normal(0.015, 0.03, len(index)))
+    return pd.DataFrame({
+        'Corporate Profits Before Tax': before_tax,
+        'Corporate Profits After Tax': before_tax * rng.uniform(0.75, 0.85, len(index))
+    }, index=index)
+
+
+def measure(run: Callable[[], object], repeat: int, setup: Optional[Callable[[], object]] = None) -> dict:
+    """Timings of `repeat` calls; `setup` runs untimed before each and its result is passed on"""
+    times = []
+    try:
+        for _ in range(repeat):
+            state = setup() if setup is not None else None
+            start = time.perf_counter()
+            run(state) if setup is not None else run()
+            times.append(time.perf_counter() - start)
+    except Exception as e:
+        return {
+            'status': 'error',
+            'error': f"{type(e).__name__}: {e}",
+            'traceback': traceback.format_exc(limit=3)
+        }
+    return {
+        'status': 'ok',
+        'repeat': repeat,
+        'min': min(times),
+        'median': statistics.median(times),
+        'mean': statistics.fmean(times),
+        'max': max(times)
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(args) -> dict:
+    series_info = {
+        series_id: info
+        for series_dict in FRED_CONFIG['series'].values()
+        for series_id, info in series_dict.items()
+    }
+    observations = synthetic_series(series_info, args.years, args.frequency, args.seed)
+    results = {}
+
+    with FREDStubServer(observations, latency=args.latency) as server:
+        def reader():
+            # Without --rate-limit the client-side limiter never waits, so the stub latency is the only delay
+            limiter = None if args.rate_limit else TokenBucket(1e9, 10 ** 9)
+            return FREDReader('benchmark', base_url=server.base_url, rate_limiter=limiter)
+
+        results['load_series_store'] = measure(
+            lambda: SeriesStore.from_series(
+                reader().load_all_series(FRED_CONFIG, preflight=False), FRED_CONFIG,
+                dtype=STORE_CONFIG['dtype']
+            ),
+            args.repeat
+        )
+
+        longest = max(observations, key=lambda series_id: len(observations[series_id]))
+        payload = requests.get(
+            f"{server.base_url}/series/observations", params={'series_id': longest}
+        ).content
+
+    results['parse_observations'] = measure(lambda: parse_observations(payload), args.repeat)
+    results['parse_observations']['observations'] = len(observations[longest])
+    results['parse_observations']['payload_bytes'] = len(payload)
+
+    results['store_build'] = measure(
+        lambda: SeriesStore.from_series(observations, FRED_CONFIG, dtype=STORE_CONFIG['dtype']),
+        args.repeat
+    )
+
+    # Stores memoize aligned grids, so each run resamples a fresh one
+    def fresh_store():
+        return SeriesStore.from_series(observations, FRED_CONFIG, dtype=STORE_CONFIG['dtype'])
+
+    frequency = STORE_CONFIG['signal_frequency']
+    results['resample'] = measure(lambda store: store.aligned(frequency), args.repeat, setup=fresh_store)
+
+    grid = fresh_store().aligned(frequency)
+    results['dashboard_signals'] = measure(
+        lambda: compute_signals(grid, FRED_CONFIG).frame(), args.repeat
+    )
+
+    raw_data = {
+        series_id: series.rename('value').rename_axis('date').reset_index()
+        for series_id, series in observations.items()
+    }
+
+    def process_data():
+        processed = FinancialDataProcessor().process_data(raw_data)
+        if processed is None:
+            raise RuntimeError("process_data returned no result")
+        # A metric whose inputs are missing is skipped silently; that would time a partial run
+        missing = set(FRED_CONFIG['calculated_metrics']) - set(processed['main_data'].columns)
+        if missing:
+            raise RuntimeError(f"process_data did not compute {', '.join(sorted(missing))}")
+
+    results['process_data'] = measure(process_data, args.repeat)
+
+    history = profit_history(args.profit_years, args.seed)
+    results['calculate_dcf'] = measure(
+        lambda: DCFModel(history, 0.08, 0.02, 5).calculate_dcf(), args.repeat
+    )
+    model = DCFModel(history, 0.08, 0.02, 5)
+    model.calculate_dcf()
+    results['sensitivity_analysis'] = measure(
+        lambda: model.sensitivity_analysis(points=args.sensitivity_points), args.repeat
+    )
+
+    return {
+        'created_at': pd.Timestamp.now(tz='UTC').isoformat(),
+        'commit': git_commit(),
+        'parameters': {
+            'years': args.years,
+            'frequency': args.frequency,
+            'latency': args.latency,
+            'rate_limit': args.rate_limit,
+            'repeat': args.repeat,
+            'profit_years': args.profit_years,
+            'sensitivity_points': args.sensitivity_points,
+            'series': len(observations),
+            'observations': int(sum(len(series) for series in observations.values()))
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__
+        },
+        'benchmarks': results
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> bool:
+    """Print best-time ratios against a baseline run; True if any benchmark regressed.
+
+    The fastest run is compared rather than the median: it is the least
+    affected by other load on the machine.
+    """
+    regressed = False
+    print(f"{'benchmark':24} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, result in current['benchmarks'].items():
+        before = baseline['benchmarks'].get(name, {})
+        if result['status'] != 'ok' or before.get('status') != 'ok':
+            print(f"{name:24} {before.get('status', 'missing'):>10} {result['status']:>10}")
+            continue
+        ratio = result['min'] / before['min']
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  REGRESSION'
+            regressed = True
+        print(f"{name:24} {before['min'] * 1000:9.2f}ms {result['min'] * 1000:9.2f}ms {ratio:6.2f}x{flag}")
+    return regressed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--years', type=int, default=30, help="History length of every series")
+    parser.add_argument('--frequency', default='native',
+                        help="pandas frequency alias for every series, or 'native' (daily/weekly/monthly mix)")
+    parser.add_argument('--latency', type=float, default=0.0, help="Stub response delay in seconds")
+    parser.add_argument('--rate-limit', action='store_true', help="Apply the FRED client rate limit")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--profit-years', type=int, default=40)
+    parser.add_argument('--sensitivity-points', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Write the results JSON here (default: stdout)")
+    parser.add_argument('--compare', help="Baseline results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed slowdown, as a fraction")
+    args = parser.parse_args()
+
+    report = run_suite(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as handle:
+            handle.write(text)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)
+        if baseline.get('parameters') != report['parameters']:
+            print("Warning: baseline was run with different parameters", file=sys.stderr)
+        return 1 if compare(report, baseline, args.threshold) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
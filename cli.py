@@ -0,0 +1,69 @@
+"""Headless entry point: refresh data and precompute results for the app.
+
+    python cli.py                       # refresh, signals and DCF
+    python cli.py signals dcf --offline # recompute from the local cache only
+    python cli.py --log-format json     # one JSON object per log line, for cron/log shippers
+    python cli.py --trace run.json      # Chrome trace of the run, for ui.perfetto.dev
+"""
+import argparse
+import json
+import logging
+import sys
+from config.settings import ENGINE_CONFIG
+from engine.batch import STEPS, BatchEngine
+from engine.results import ResultStore
+from utils.tracing import start_trace
+
+
+class JsonFormatter(logging.Formatter):
+    """Log records as single-line JSON objects"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps({
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        })
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Refresh FRED data and precompute signals and valuations")
+    parser.add_argument('steps', nargs='*', metavar='step',
+                        help=f"Steps to run: {', '.join(STEPS)} (default: all)")
+    parser.add_argument('--offline', action='store_true', help="Serve series from the local cache only")
+    parser.add_argument('--monte-carlo', action='store_true', default=ENGINE_CONFIG['monte_carlo'],
+                        help="Add the Monte Carlo valuation distribution")
+    parser.add_argument('--output', default=ENGINE_CONFIG['results_path'], help="Results file")
+    parser.add_argument('--base-url', help="FRED API base URL (e.g. a local stub)")
+    parser.add_argument('--log-format', choices=['text', 'json'], default='text')
+    parser.add_argument('--log-level', default='INFO')
+    parser.add_argument('--trace', metavar='PATH', help="Write a Chrome trace of the run's spans here")
+    args = parser.parse_args(argv)
+    unknown = [step for step in args.steps if step not in STEPS]
+    if unknown:
+        parser.error(f"unknown steps: {', '.join(unknown)}")
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    handler = logging.StreamHandler()
+    if args.log_format == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+    logging.basicConfig(level=args.log_level.upper(), handlers=[handler])
+
+    engine = BatchEngine(ResultStore(args.output), base_url=args.base_url, offline=args.offline)
+    with start_trace('cli: ' + ' '.join(args.steps or STEPS), enabled=bool(args.trace)) as trace:
+        results = engine.run(args.steps or None, monte_carlo=args.monte_carlo)
+    if trace is not None:
+        with open(args.trace, 'w') as handle:
+            handle.write(trace.to_json(chrome=True))
+    return 0 if results is not None else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -173,6 +173,36 @@ FRED_CONFIG = {
                 'units': 'lin'
             }
         }
+    },
+    # Series FinancialDataProcessor needs, and the metrics it derives from them.
+    # Formulas are arithmetic over series IDs and other metrics' keys (+ - * / **,
+    # abs, exp, log, sqrt); they are checked when first compiled, see data/metrics.py
+    'required_metrics': {
+        'USLAH': {'name': 'All Employees, Leisure and Hospitality'},
+        'CES7000000003': {'name': 'Average Hourly Earnings'},
+        'AWHAELAH': {'name': 'Average Weekly Hours'},
+        'JTS7000JOL': {'name': 'Job Openings'},
+        'JTS7000HIL': {'name': 'Hires'},
+        'PAYEMS': {'name': 'All Employees, Total Nonfarm'}
+    },
+    'calculated_metrics': {
+        'WEEKLY_EARNINGS': {
+            'name': 'Average Weekly Earnings',
+            'formula': 'CES7000000003 * AWHAELAH'
+        },
+        'WEEKLY_PAYROLL': {
+            'name': 'Weekly Payroll ($M)',
+            'formula': 'USLAH * WEEKLY_EARNINGS / 1000'  # USLAH is in thousands
+        },
+        'EMPLOYMENT_SHARE': {
+            'name': 'Share of Nonfarm Employment',
+            'formula': 'USLAH / PAYEMS * 100',
+            'is_percent': True
+        },
+        'OPENINGS_PER_HIRE': {
+            'name': 'Job Openings per Hire',
+            'formula': 'JTS7000JOL / JTS7000HIL'
+        }
     }
 }
 
@@ -184,5 +214,120 @@ DISPLAY_CONFIG = {
         'height': 600,
         'template': 'plotly_white',
         'colors': ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
-    }
-}
\ No newline at end of file
+    },
+    # Charts are downsampled to about one point per pixel of their width
+    'chart_width_px': {
+        'card': 400,
+        'full': 1200
+    },
+    'downsample_method': 'lttb',  # 'lttb' or 'minmax'
+    'chart_range_cache_entries': 256,  # Downsampled date-range selections kept per store
+    'figure_cache_mb': 64,  # Built chart figures kept across reruns, by serialized size
+    # Only the selected category is rendered, a page of metrics at a time
+    'cards_per_page': 6,
+    'series_per_page': 4,
+}
+
+# Downloads, generated only when requested
+EXPORT_CONFIG = {
+    'cache_mb': 32,  # Generated export files kept for repeat downloads
+    'parquet_row_group': 100_000,  # Dates written per Parquet row group
+}
+
+# FRED fetch settings
+FETCH_CONFIG = {
+    'max_workers': 8,  # Concurrent series requests during a refresh
+    'pool_maxsize': 8,  # Keep-alive connections held by the shared session
+    'incremental': True,  # Refresh cached series with a delta request only
+    'revision_window_days': 365,  # Per-series override: 'revision_window_days' in FRED_CONFIG
+    'updates_lookback_days': 13,  # series/updates only covers the last two weeks
+    # series/updates lists every FRED series updated in the window, not just ours; 'macro'
+    # leaves out regional series. Listings over the page budget fall back to per-series
+    # metadata requests, which is the usual case against the real API
+    'updates_filter': 'macro',
+    'updates_page_size': 1000,
+    'updates_max_pages': 5,
+    # FRED allows 120 requests per minute per API key
+    'requests_per_minute': 120,
+    'burst': 10,  # Requests allowed back to back before the rate limit applies
+    'connect_timeout_seconds': 5,
+    'read_timeout_seconds': 30,
+    'max_retries': 4,  # For 429s, 5xx responses, timeouts and dropped connections
+    'backoff_base_seconds': 0.5,
+    'backoff_max_seconds': 30,
+    'concurrency_increase_after': 10,  # Successes before a throttled concurrency limit grows by one
+}
+
+# Local observation cache
+CACHE_CONFIG = {
+    'path': '.cache/fred_observations.sqlite',
+    'default_ttl_hours': 12,  # Per-series override: 'cache_ttl_hours' in FRED_CONFIG
+}
+
+# Background refresh of the shared store
+REFRESH_CONFIG = {
+    'enabled': True,  # Pages then only read local data and never wait on FRED
+    'tick_seconds': 60,  # How often the worker looks for due series
+    # Refresh interval by native frequency; per-series override: 'cache_ttl_hours' in FRED_CONFIG
+    'intervals_hours': {
+        'Daily': 4, 'Weekly': 12, 'Monthly': 24, 'Quarterly': 72, 'Annual': 168, 'Unknown': 12
+    },
+    'retry_minutes': 15,  # Delay before a failed series is tried again
+    'stale_factor': 2,  # Flagged stale when older than this many refresh intervals
+    'status_poll_seconds': 10,  # How often open sessions check for newly published data
+    'lock_path': '.cache/scheduler.lock',  # One server process refreshes; the others follow its snapshots
+}
+
+# In-memory series store
+STORE_CONFIG = {
+    'dtype': 'float64',  # 'float32' halves memory at reduced precision
+    'snapshot_path': '.cache/series_snapshot.bin',  # Memory-mapped by every server process
+    # Series are stored at their native frequency and aligned on demand
+    'signal_frequency': 'ME',  # Grid the dashboard statuses and the backtest are computed on
+    'aggregation': 'last',  # Per-series override: 'aggregation' in FRED_CONFIG
+    'table_frequencies': {'Native': None, 'Weekly': 'W', 'Monthly': 'ME', 'Quarterly': 'QE'},
+}
+
+# Monte Carlo DCF defaults
+MONTE_CARLO_CONFIG = {
+    'n_paths': 1_000_000,
+    'chunk_size': 100_000,  # Paths held in memory at once
+    'wacc_std': 0.01,
+    'terminal_growth_std': 0.005,
+    'percentiles': [5, 25, 50, 75, 95],
+}
+
+# Inputs and defaults of the batch DCF valuation
+DCF_CONFIG = {
+    # DCFEngine column -> FRED series (quarterly, billions of dollars, SAAR)
+    'inputs': {
+        'Corporate Profits Before Tax': {'series_id': 'A053RC1Q027SBEA', 'units': 'lin'},
+        'Corporate Profits After Tax': {'series_id': 'CP', 'units': 'lin'},
+    },
+    'wacc': 0.08,
+    'terminal_growth': 0.02,
+    'forecast_years': 5,
+    'sensitivity_points': 5,
+    'sensitivity_spread': 0.02,
+}
+
+# Status signal backtest
+BACKTEST_CONFIG = {
+    'targets': ['USLAH', 'DFSARC1Q027SBEA'],  # Series whose drawdowns the statuses should anticipate
+    'horizon_days': 365,
+    'drawdown_threshold': 0.02,  # Relative decline for level series
+    'drawdown_points': 2.0,  # Decline in points for percent / pc1 series
+    'cache_entries': 16,  # Results for the most recently used horizon/threshold settings
+}
+
+# Headless engine (python cli.py): results read by the pages
+ENGINE_CONFIG = {
+    'results_path': '.cache/engine_results.json',
+    'monte_carlo': False,  # The simulation adds seconds to each batch run
+}
+
+# Span instrumentation of reruns and engine runs; spans cost nothing unless a trace is recorded
+PROFILE_CONFIG = {
+    'enabled': False,  # Default of the sidebar "Profile reruns" toggle
+    'max_spans': 10_000,  # Per trace; later spans are counted as dropped
+}
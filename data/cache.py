@@ -0,0 +1,224 @@
+import os
+import sqlite3
+import threading
+import time
+import pandas as pd
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+
+class ObservationCache:
+    """Persistent SQLite store of raw FRED observations keyed by (series_id, units)"""
+
+    def __init__(self, path: str, default_ttl_hours: float = 12):
+        self.path = path
+        self.default_ttl_hours = default_ttl_hours
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._create_tables()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection; one per call keeps the cache safe across fetch threads"""
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def _create_tables(self):
+        with self._connect() as connection:
+            # WAL lets readers proceed while a refresh is writing
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS observations (
+                    series_id TEXT NOT NULL,
+                    units TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    value REAL,
+                    PRIMARY KEY (series_id, units, date)
+                )
+                """
+            )
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS series_meta (
+                    series_id TEXT NOT NULL,
+                    units TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    last_updated TEXT,
+                    checked_at REAL,
+                    PRIMARY KEY (series_id, units)
+                )
+                """
+            )
+
+            # Caches created before update tracking lack the metadata columns
+            columns = {row[1] for row in connection.execute('PRAGMA table_info(series_meta)')}
+            for column, column_type in (('last_updated', 'TEXT'), ('checked_at', 'REAL')):
+                if column not in columns:
+                    connection.execute(f'ALTER TABLE series_meta ADD COLUMN {column} {column_type}')
+
+    def ttl_seconds(self, series_info: dict) -> float:
+        """Time-to-live for a series, from its config or the cache default"""
+        return series_info.get('cache_ttl_hours', self.default_ttl_hours) * 3600
+
+    def fetched_at(self, series_id: str, units: str) -> Optional[float]:
+        """Unix time of the last successful download, or None if never cached"""
+        with self._connect() as connection:
+            row = connection.execute(
+                'SELECT fetched_at FROM series_meta WHERE series_id = ? AND units = ?',
+                (series_id, units)
+            ).fetchone()
+        return row[0] if row else None
+
+    def fetched_times(self) -> Dict[Tuple[str, str], float]:
+        """Last download time of every cached (series_id, units), read in one query"""
+        with self._connect() as connection:
+            rows = connection.execute('SELECT series_id, units, fetched_at FROM series_meta').fetchall()
+        return {(series_id, units): fetched_at for series_id, units, fetched_at in rows}
+
+    def is_fresh(self, series_id: str, series_info: dict) -> bool:
+        """True if the series was downloaded within its TTL"""
+        fetched_at = self.fetched_at(series_id, series_info.get('units', 'lin'))
+        if fetched_at is None:
+            return False
+        return time.time() - fetched_at < self.ttl_seconds(series_info)
+
+    def read(self, series_id: str, units: str) -> Optional[pd.Series]:
+        """Read cached observations as a date-indexed series"""
+        with self._connect() as connection:
+            rows = connection.execute(
+                'SELECT date, value FROM observations '
+                'WHERE series_id = ? AND units = ? ORDER BY date',
+                (series_id, units)
+            ).fetchall()
+
+        if not rows:
+            return None
+
+        dates, values = zip(*rows)
+        return pd.Series(
+            values,
+            index=pd.DatetimeIndex(pd.to_datetime(dates, format='%Y-%m-%d'), name='date'),
+            name='value',
+            dtype=float
+        )
+
+    def write(self, series_id: str, units: str, series: pd.Series):
+        """Replace the cached observations for a series and stamp the download time"""
+        rows = [
+            (series_id, units, date.strftime('%Y-%m-%d'), float(value))
+            for date, value in series.items()
+        ]
+        with self._connect() as connection:
+            connection.execute(
+                'DELETE FROM observations WHERE series_id = ? AND units = ?',
+                (series_id, units)
+            )
+            connection.executemany(
+                'INSERT INTO observations (series_id, units, date, value) VALUES (?, ?, ?, ?)',
+                rows
+            )
+            self._stamp_fetch(connection, series_id, units)
+
+    def last_date(self, series_id: str, units: str) -> Optional[pd.Timestamp]:
+        """Date of the latest cached observation, or None if nothing is stored"""
+        with self._connect() as connection:
+            row = connection.execute(
+                'SELECT MAX(date) FROM observations WHERE series_id = ? AND units = ?',
+                (series_id, units)
+            ).fetchone()
+        return pd.Timestamp(row[0]) if row and row[0] else None
+
+    def merge(self, series_id: str, units: str, series: Optional[pd.Series], since: pd.Timestamp):
+        """Replace cached observations from `since` onwards with a freshly downloaded delta.
+
+        Rows inside the window that FRED no longer reports are dropped, so
+        revisions and withdrawn points are reflected as well as new ones. An
+        empty delta leaves the cached observations as they are: it is far
+        more likely a truncated response than a withdrawn year of data.
+        """
+        since_text = since.strftime('%Y-%m-%d')
+        rows = [] if series is None else [
+            (series_id, units, date.strftime('%Y-%m-%d'), float(value))
+            for date, value in series.items()
+        ]
+        with self._connect() as connection:
+            if rows:
+                connection.execute(
+                    'DELETE FROM observations WHERE series_id = ? AND units = ? AND date >= ?',
+                    (series_id, units, since_text)
+                )
+                connection.executemany(
+                    'INSERT INTO observations (series_id, units, date, value) VALUES (?, ?, ?, ?)',
+                    rows
+                )
+            self._stamp_fetch(connection, series_id, units)
+
+    @staticmethod
+    def _stamp_fetch(connection: sqlite3.Connection, series_id: str, units: str):
+        connection.execute(
+            'INSERT INTO series_meta (series_id, units, fetched_at) VALUES (?, ?, ?) '
+            'ON CONFLICT (series_id, units) DO UPDATE SET fetched_at = excluded.fetched_at',
+            (series_id, units, time.time())
+        )
+
+    def update_state(self, series_id: str, units: str) -> Tuple[Optional[str], Optional[float]]:
+        """Stored FRED last_updated stamp and the time it was last checked"""
+        with self._connect() as connection:
+            row = connection.execute(
+                'SELECT last_updated, checked_at FROM series_meta WHERE series_id = ? AND units = ?',
+                (series_id, units)
+            ).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+    def mark_checked(self, series_id: str, units: str, last_updated: str, validated: bool = False):
+        """Record the upstream last_updated stamp for a cached series.
+
+        With `validated`, the cached observations are confirmed current and
+        their TTL restarts as if they had just been downloaded.
+        """
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute(
+                'UPDATE series_meta SET last_updated = ?, checked_at = ? '
+                'WHERE series_id = ? AND units = ?',
+                (last_updated, now, series_id, units)
+            )
+            if validated:
+                connection.execute(
+                    'UPDATE series_meta SET fetched_at = ? WHERE series_id = ? AND units = ?',
+                    (now, series_id, units)
+                )
+
+    def has_entries(self) -> bool:
+        """True if anything has been cached yet"""
+        with self._connect() as connection:
+            row = connection.execute('SELECT 1 FROM series_meta LIMIT 1').fetchone()
+        return row is not None
+
+    def record_hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def stats(self) -> dict:
+        """Cache hit/miss counters since the cache was created"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0
+            }
@@ -1,13 +1,20 @@
 import pandas as pd
 import numpy as np
+from typing import Optional
 from config.settings import FRED_CONFIG
-import streamlit as st
+from data.metrics import MetricValues, get_metric_graph
+from utils.progress import Reporter
+from utils.tracing import traced
 
 
 class FinancialDataProcessor:
-    def __init__(self):
+    def __init__(self, reporter: Optional[Reporter] = None):
+        self.reporter = reporter or Reporter()
         self.required_metrics = FRED_CONFIG['required_metrics']
         self.calculated_metrics = FRED_CONFIG['calculated_metrics']
+        self.metric_graph = get_metric_graph()
+        # Metrics from the last calculate_metrics call; unchanged inputs reuse them
+        self._metric_values: Optional[MetricValues] = None
 
     def validate_data(self, df: pd.DataFrame) -> bool:
         """Validate that all required metrics are present"""
@@ -16,26 +23,20 @@ class FinancialDataProcessor:
         missing_columns = required_columns - existing_columns
 
         if missing_columns:
-            st.error(f"Missing required metrics: {missing_columns}")
+            self.reporter.error(f"Missing required metrics: {missing_columns}")
             return False
         return True
 
+    @traced('processor.calculate_metrics')
     def calculate_metrics(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Calculate all derived financial metrics"""
+        """Add the derived metrics, recomputing only those whose inputs changed since the last call"""
         if not self.validate_data(df):
             return df
 
-        result_df = df.copy()
-
-        # Calculate each metric in order
-        for metric_name, metric_info in self.calculated_metrics.items():
-            try:
-                result_df[metric_name] = metric_info['formula'](result_df)
-            except Exception as e:
-                st.error(f"Error calculating {metric_name}: {str(e)}")
-
-        return result_df
+        self._metric_values = self.metric_graph.evaluate(df, self._metric_values)
+        return self._metric_values.join(df)
 
+    @traced('processor.growth_rates')
     def calculate_growth_rates(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate year-over-year growth rates"""
         if df.empty:
@@ -49,6 +50,7 @@ class FinancialDataProcessor:
 
         return growth_df
 
+    @traced('processor.margins')
     def calculate_margins(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate various profit margins"""
         if not self.validate_data(df):
@@ -66,22 +68,19 @@ class FinancialDataProcessor:
 
         return margins_df
 
+    @traced('processor.process_data')
     def process_data(self, raw_data: dict) -> dict:
         """Process raw financial data into analyzable format"""
         try:
-            # Combine all series into a single DataFrame
-            df = pd.DataFrame()
-            for metric, data in raw_data.items():
-                if 'date' in data.columns and 'value' in data.columns:
-                    temp_df = data.pivot(index='date', columns=None, values='value')
-                    temp_df.columns = [metric]
-                    if df.empty:
-                        df = temp_df
-                    else:
-                        df = df.join(temp_df, how='outer')
-
-            # Sort by date
-            df.sort_index(inplace=True)
+            # Combine all series into a single DataFrame, aligned on the union of their dates
+            df = pd.concat(
+                {
+                    metric: data.set_index('date')['value']
+                    for metric, data in raw_data.items()
+                    if 'date' in data.columns and 'value' in data.columns
+                },
+                axis=1
+            ).sort_index()
 
             # Calculate derived metrics
             df = self.calculate_metrics(df)
@@ -97,9 +96,10 @@ class FinancialDataProcessor:
             }
 
         except Exception as e:
-            st.error(f"Error processing data: {str(e)}")
+            self.reporter.error(f"Error processing data: {str(e)}")
             return None
 
+    @traced('processor.prepare_dcf_data')
     def prepare_dcf_data(self, df: pd.DataFrame, forecast_years: int = 5) -> dict:
         """Prepare data for DCF analysis"""
         if not self.validate_data(df):
@@ -150,5 +150,5 @@ class FinancialDataProcessor:
             }
 
         except Exception as e:
-            st.error(f"Error preparing DCF data: {str(e)}")
+            self.reporter.error(f"Error preparing DCF data: {str(e)}")
             return None
\ No newline at end of file
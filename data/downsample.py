@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+from typing import Optional
+from config.settings import DISPLAY_CONFIG
+from data.series_store import SeriesStore
+from utils.tracing import span
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of n_out points preserving the line shape"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # First and last points are kept; the rest are split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+
+        # Average of the next bucket (or the last point) is the third vertex
+        if bucket + 2 < len(edges):
+            next_start, next_end = edges[bucket + 1], edges[bucket + 2]
+            next_x = x[next_start:next_end].mean()
+            next_y = y[next_start:next_end].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+
+        bucket_x = x[start:end]
+        bucket_y = y[start:end]
+        area = np.abs(
+            (x[previous] - next_x) * (bucket_y - y[previous])
+            - (x[previous] - bucket_x) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+
+    return selected
+
+
+def minmax_indices(y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """Indices of the minimum and maximum of each of n_buckets equal-count buckets"""
+    n = len(y)
+    if 2 * n_buckets >= n:
+        return np.arange(n)
+
+    bucket = np.arange(n) * n_buckets // n
+    # Sorting by (bucket, value) puts each bucket's min first and max last
+    order = np.lexsort((y, bucket))
+    boundaries = np.flatnonzero(np.diff(bucket[order])) + 1
+    first = np.concatenate(([0], boundaries))
+    last = np.concatenate((boundaries - 1, [n - 1]))
+    return np.unique(np.concatenate((order[first], order[last])))
+
+
+def downsample_series(series: pd.Series, width_px: int, method: str = 'lttb') -> pd.Series:
+    """Reduce a series to about one point per pixel of chart width (two for min/max)"""
+    if series.empty:
+        return series
+
+    y = series.to_numpy(dtype=float)
+    if method == 'minmax':
+        indices = minmax_indices(y, width_px)
+    else:
+        x = series.index.values.astype('datetime64[ns]').astype(np.int64).astype(float)
+        indices = lttb_indices(x, y, width_px)
+
+    if len(indices) == len(series):
+        return series
+    return series.iloc[indices]
+
+
+def chart_series(store: SeriesStore, series_id: str, width_px: int, method: str = 'lttb',
+                 start: Optional[pd.Timestamp] = None, end: Optional[pd.Timestamp] = None,
+                 full_resolution: bool = False) -> pd.Series:
+    """Series points to plot for a chart of the given width and date range.
+
+    Downsampled results are cached on the store per series, width, method
+    and range, so reruns reuse them until new data is published. Ranged
+    results are kept for the most recently used ranges only.
+    """
+    def compute():
+        series = store.series(series_id)
+        if start is not None or end is not None:
+            series = series.loc[start:end]
+        if full_resolution:
+            return series
+        with span('chart.downsample', series_id=series_id, points=len(series)):
+            return downsample_series(series, width_px, method)
+
+    if start is None and end is None:
+        return store.memo(('chart_series', series_id, width_px, method, full_resolution), compute)
+    return store.memo_recent(
+        'chart_series', (series_id, width_px, method, start, end, full_resolution), compute,
+        DISPLAY_CONFIG['chart_range_cache_entries']
+    )
@@ -1,91 +1,395 @@
+import threading
+import time
 import requests
+import numpy as np
 import pandas as pd
-import streamlit as st
-from typing import Dict, Optional
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Dict, Optional, Set, Tuple
+from datetime import datetime, timedelta
+from config.settings import FETCH_CONFIG, FRED_CONFIG
+from data.cache import ObservationCache
+from data.fred_parser import parse_observations
+from data.rate_limit import (
+    RETRYABLE_STATUS, AdaptiveConcurrency, RequestMetrics, TokenBucket,
+    backoff_delay, get_concurrency, get_rate_limiter
+)
+from utils.progress import Reporter
+from utils.tracing import propagate, span
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    """Seconds from a Retry-After header, if it holds a number"""
+    try:
+        return float(response.headers['Retry-After'])
+    except (KeyError, ValueError):
+        return None
 
 
 class FREDReader:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, max_workers: int = FETCH_CONFIG['max_workers'],
+                 cache: Optional[ObservationCache] = None, offline: bool = False,
+                 incremental: bool = FETCH_CONFIG['incremental'],
+                 base_url: Optional[str] = None,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 concurrency: Optional[AdaptiveConcurrency] = None,
+                 max_retries: int = FETCH_CONFIG['max_retries'],
+                 reporter: Optional[Reporter] = None):
         self.api_key = api_key
-        self.base_url = "https://api.stlouisfed.org/fred"
+        # Progress and errors are logged unless a page passes a StreamlitReporter
+        self.reporter = reporter or Reporter()
+        self.base_url = base_url or FRED_CONFIG['base_url']
+        self.max_workers = max_workers
+        # Limits are shared with every other reader of the same API in this process
+        self.rate_limiter = rate_limiter or get_rate_limiter(self.base_url)
+        self.concurrency = concurrency or get_concurrency(self.base_url)
+        self.max_retries = max_retries
+        self.timeout = (FETCH_CONFIG['connect_timeout_seconds'], FETCH_CONFIG['read_timeout_seconds'])
+        self.metrics = RequestMetrics()
+        self.cache = cache
+        self.offline = offline
+        self.incremental = incremental
+        self.session = self._create_session()
+        self.timings = {}
+        self.request_count = 0
+        self._request_lock = threading.Lock()
+        self._pending_updates = {}
+        self._validated = set()
 
-    def get_series_data(self, series_id: str, series_info: dict) -> Optional[pd.DataFrame]:
-        """Fetch series data with specified units"""
+    def _create_session(self) -> requests.Session:
+        """Create a shared session so all requests reuse keep-alive connections"""
+        session = requests.Session()
+        pool_size = max(FETCH_CONFIG['pool_maxsize'], self.max_workers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def _get(self, path: str, params: dict) -> requests.Response:
+        """Issue a rate-limited GET against the FRED API over the shared session.
+
+        Throttling (429), transient server errors, timeouts and dropped
+        connections are retried with jittered exponential backoff; other
+        errors are raised at once.
+        """
+        params = dict(params, api_key=self.api_key, file_type='json')
+        url = f"{self.base_url}/{path}"
+
+        for attempt in range(self.max_retries + 1):
+            with span('fred.rate_wait'):
+                self.metrics.add(rate_wait_seconds=self.rate_limiter.acquire())
+            retry_after = None
+
+            with self.concurrency.slot():
+                with self._request_lock:
+                    self.request_count += 1
+                self.metrics.add(requests=1)
+                try:
+                    with span('fred.request', path=path, attempt=attempt) as request_span:
+                        response = self.session.get(url, params=params, timeout=self.timeout)
+                        request_span.set(status=response.status_code, bytes=len(response.content))
+                except requests.Timeout as e:
+                    self.metrics.add(timeouts=1)
+                    error = e
+                except requests.ConnectionError as e:
+                    error = e
+                else:
+                    if response.status_code not in RETRYABLE_STATUS:
+                        if not response.ok:
+                            self.metrics.add(failures=1)
+                        response.raise_for_status()
+                        self.metrics.add(successes=1)
+                        self.concurrency.on_success()
+                        return response
+
+                    if response.status_code == 429:
+                        self.metrics.add(throttled=1)
+                        self.concurrency.on_throttle()
+                    else:
+                        self.metrics.add(server_errors=1)
+                    retry_after = _retry_after(response)
+                    error = requests.HTTPError(
+                        f"{response.status_code} Error for url: {response.url}", response=response
+                    )
+
+            if attempt < self.max_retries:
+                delay = backoff_delay(attempt, retry_after=retry_after)
+                self.metrics.add(retries=1, backoff_seconds=delay)
+                time.sleep(delay)
+
+        self.metrics.add(failures=1)
+        raise error
+
+    def _download_observations(self, series_id: str, series_info: dict,
+                               observation_start: Optional[pd.Timestamp] = None) -> Optional[pd.Series]:
+        """Download the raw observations of a series, without missing values"""
         end_date = datetime.now().strftime('%Y-%m-%d')
 
         params = {
             'series_id': series_id,
-            'api_key': self.api_key,
-            'file_type': 'json',
             'units': series_info.get('units', 'lin'),
             'observation_end': end_date
         }
+        if observation_start is not None:
+            params['observation_start'] = observation_start.strftime('%Y-%m-%d')
 
-        try:
-            response = requests.get(
-                f"{self.base_url}/series/observations",
-                params=params
-            )
-            response.raise_for_status()
-
-            data = response.json()
-            if not data.get('observations'):
+        response = self._get('series/observations', params)
+
+        with span('fred.parse', series_id=series_id, bytes=len(response.content)):
+            dates, values = parse_observations(response.content)
+        if not len(dates):
+            return None
+
+        # Remove missing values
+        observed = ~np.isnan(values)
+        return pd.Series(
+            values[observed],
+            index=pd.DatetimeIndex(dates[observed], name='date'),
+            name='value'
+        )
+
+    def _load_observations(self, series_id: str, series_info: dict) -> Optional[pd.Series]:
+        """Serve observations from the cache when fresh (or offline), else download"""
+        if self.cache is None:
+            if self.offline:
+                raise LookupError("Offline mode requires an observation cache")
+            return self._download_observations(series_id, series_info)
+
+        units = series_info.get('units', 'lin')
+        if (self.offline or series_id in self._validated
+                or self.cache.is_fresh(series_id, series_info)):
+            with span('cache.read', series_id=series_id):
+                cached = self.cache.read(series_id, units)
+            if cached is not None:
+                self.cache.record_hit()
+                return cached
+
+        self.cache.record_miss()
+        if self.offline:
+            raise LookupError(f"{series_id} is not cached and offline mode is enabled")
+
+        last_date = self.cache.last_date(series_id, units) if self.incremental else None
+        if last_date is None:
+            observations = self._download_observations(series_id, series_info)
+            if observations is not None:
+                self.cache.write(series_id, units, observations)
+                self._record_update(series_id, units)
+            return observations
+
+        # Only re-request the revision window before the newest stored point
+        window = series_info.get('revision_window_days', FETCH_CONFIG['revision_window_days'])
+        since = last_date - pd.Timedelta(days=window)
+        delta = self._download_observations(series_id, series_info, observation_start=since)
+        self.cache.merge(series_id, units, delta, since)
+        self._record_update(series_id, units)
+        return self.cache.read(series_id, units)
+
+    def _record_update(self, series_id: str, units: str):
+        """Store the pre-flight last_updated stamp once the new data is cached"""
+        last_updated = self._pending_updates.pop(series_id, None)
+        if last_updated is not None:
+            self.cache.mark_checked(series_id, units, last_updated)
+
+    def fetch_last_updated(self, series_id: str) -> Optional[str]:
+        """Upstream last_updated stamp of a single series"""
+        data = self._get('series', {'series_id': series_id}).json()
+        seriess = data.get('seriess') or []
+        return seriess[0].get('last_updated') if seriess else None
+
+    def fetch_recent_updates(self, since: datetime) -> Optional[Dict[str, str]]:
+        """Page through series/updates since `since`.
+
+        Returns {series_id: last_updated} for every series FRED reports as
+        updated, or None when the listing is longer than the page budget.
+        The listing cannot be narrowed to the configured series: on the
+        real API even a day of national ('macro') updates often exceeds the
+        budget, in which case this costs one request and the caller falls
+        back to per-series checks.
+        """
+        updates = {}
+        offset = 0
+        limit = FETCH_CONFIG['updates_page_size']
+        max_pages = FETCH_CONFIG['updates_max_pages']
+
+        for _ in range(max_pages):
+            data = self._get('series/updates', {
+                'filter_value': FETCH_CONFIG['updates_filter'],
+                'start_time': since.strftime('%Y%m%d%H%M'),
+                'end_time': datetime.now().strftime('%Y%m%d%H%M'),
+                'limit': limit,
+                'offset': offset
+            }).json()
+            if data.get('count', 0) > limit * max_pages:
+                # Known from the first page; paging further would only waste requests
                 return None
+            seriess = data.get('seriess') or []
+            for series in seriess:
+                updates[series['id']] = series['last_updated']
 
-            # Convert to DataFrame
-            df = pd.DataFrame(data['observations'])
-            df['date'] = pd.to_datetime(df['date'])
-            df['value'] = pd.to_numeric(df['value'], errors='coerce')
+            offset += len(seriess)
+            if len(seriess) < limit or offset >= data.get('count', 0):
+                return updates
 
-            # Remove missing values
-            df = df.dropna()
+        return None
 
-            # Set date as index and get last value of each month
-            df.set_index('date', inplace=True)
-            monthly_df = df.resample('ME').agg({'value': 'last'})
-            monthly_df = monthly_df['value']  # Convert back to series
+    def find_changed_series(self, series: Dict[str, dict]) -> Tuple[Set[str], Dict[str, str]]:
+        """Pre-flight: compare upstream last_updated stamps with the cached ones.
 
+        Series checked recently are covered by one paged series/updates
+        listing; the rest fall back to one series request each. Returns the
+        ids that need downloading and the upstream stamps that were seen.
+        """
+        stored = {
+            series_id: self.cache.update_state(series_id, info.get('units', 'lin'))
+            for series_id, info in series.items()
+        }
+        checked_at = [
+            checked for last_updated, checked in stored.values()
+            if last_updated is not None and checked is not None
+        ]
+
+        remote = {}
+        lookback = timedelta(days=FETCH_CONFIG['updates_lookback_days'])
+        if checked_at and datetime.now() - datetime.fromtimestamp(min(checked_at)) < lookback:
+            # A day of margin absorbs the gap between local time and FRED's clock
+            since = datetime.fromtimestamp(min(checked_at)) - timedelta(days=1)
+            recent = self.fetch_recent_updates(since)
+            if recent is not None:
+                for series_id, (last_updated, checked) in stored.items():
+                    if last_updated is not None and checked is not None:
+                        # Absent from the listing means unchanged since the check
+                        remote[series_id] = recent.get(series_id, last_updated)
+
+        unknown = [series_id for series_id in series if series_id not in remote]
+
+        def lookup(series_id):
+            try:
+                return series_id, self.fetch_last_updated(series_id)
+            except Exception:
+                return series_id, None
+
+        if unknown:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for series_id, last_updated in executor.map(propagate(lookup), unknown):
+                    if last_updated is not None:
+                        remote[series_id] = last_updated
+
+        changed = {
+            series_id for series_id in series
+            if series_id not in remote or remote[series_id] != stored[series_id][0]
+        }
+        return changed, remote
+
+    def preflight(self, series: Dict[str, dict]) -> Set[str]:
+        """Validate stale cached series against FRED metadata before downloading.
 
-            print(monthly_df)
-            return monthly_df
+        Unchanged series have their cache TTL restarted so they are served
+        locally; returns the ids that still need to be fetched.
+        """
+        # Series with nothing cached must be downloaded regardless
+        stale = {
+            series_id: info for series_id, info in series.items()
+            if self.cache.fetched_at(series_id, info.get('units', 'lin')) is not None
+            and not self.cache.is_fresh(series_id, info)
+        }
+        if not stale:
+            return set()
 
+        try:
+            changed, remote = self.find_changed_series(stale)
+        except Exception:
+            return set(stale)
+
+        for series_id, info in stale.items():
+            if series_id not in remote:
+                continue
+            if series_id in changed:
+                self._pending_updates[series_id] = remote[series_id]
+            else:
+                self.cache.mark_checked(
+                    series_id, info.get('units', 'lin'), remote[series_id], validated=True
+                )
+                self._validated.add(series_id)
+        return changed
+
+    def fetch_series(self, series_id: str, series_info: dict) -> Optional[pd.Series]:
+        """Fetch series data at its native frequency, raising on request errors"""
+        start = time.perf_counter()
+        try:
+            with span('fred.fetch_series', series_id=series_id):
+                observations = self._load_observations(series_id, series_info)
+            if observations is None or observations.empty:
+                return None
+            return observations
+        finally:
+            self.timings[series_id] = time.perf_counter() - start
+
+    def get_series_data(self, series_id: str, series_info: dict) -> Optional[pd.Series]:
+        """Fetch series data with specified units"""
+        try:
+            return self.fetch_series(series_id, series_info)
         except Exception as e:
-            st.error(f"Error fetching {series_id}: {str(e)}")
+            self.reporter.error(f"Error fetching {series_id}: {str(e)}")
             return None
 
-    def load_category_data(self, category_series: Dict) -> pd.DataFrame:
-        """Load data for a specific category with independent date ranges for each series"""
-        data_frames = {}
+    def fetch_many(self, series: Dict[str, dict]) -> Tuple[Dict[str, pd.Series], Dict[str, str]]:
+        """Fetch several series concurrently over the shared session.
 
-        for series_id, info in category_series.items():
-            with st.spinner(f"Loading {info['name']}..."):
-                series_data = self.get_series_data(series_id, info)
-                if series_data is not None and not series_data.empty:
-                    data_frames[series_id] = series_data
-                    st.success(f"Loaded {info['name']}")
-                else:
-                    st.error(f"Failed to load {info['name']}")
+        Worker threads never touch Streamlit; results and error messages are
+        returned so the caller can report them from the script thread.
+        """
+        results = {}
+        errors = {}
 
-        if data_frames:
+        def fetch(item):
+            series_id, info = item
             try:
-                # Combine all series without restricting to a common date range
-                df = pd.concat(data_frames, axis=1)
-                return df
+                return series_id, self.fetch_series(series_id, info), None
             except Exception as e:
-                st.error(f"Error combining data: {str(e)}")
-                return None
+                return series_id, None, str(e)
 
-        return None
+        with span('fred.fetch_many', series=len(series)), \
+                ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for series_id, series_data, error in executor.map(propagate(fetch), series.items()):
+                if error is not None:
+                    errors[series_id] = error
+                elif series_data is not None and not series_data.empty:
+                    results[series_id] = series_data
+
+        return results, errors
+
+    def load_all_series(self, config: Dict, preflight: bool = True) -> Dict[str, pd.Series]:
+        """Fetch every configured series concurrently, reporting failures"""
+        all_series = {
+            series_id: info
+            for series_dict in config['series'].values()
+            for series_id, info in series_dict.items()
+        }
+        self.timings = {}
+        self.metrics = RequestMetrics()
+
+        self._validated = set()
+        if preflight and self.cache is not None and not self.offline:
+            with span('fred.preflight', series=len(all_series)):
+                self.preflight(all_series)
+
+        results, errors = self.fetch_many(all_series)
+
+        for series_id, info in all_series.items():
+            if series_id in errors:
+                self.reporter.error(f"Error fetching {series_id}: {errors[series_id]}")
+            elif series_id not in results:
+                self.reporter.error(f"Failed to load {info['name']}")
 
-    def load_all_categories(self, config: Dict) -> Dict[str, pd.DataFrame]:
-        """Load data for all categories"""
-        category_data = {}
+        return results
 
-        for category_name, series_dict in config['series'].items():
-            st.subheader(f"Loading {category_name} Data")
-            df = self.load_category_data(series_dict)
-            if df is not None and not df.empty:
-                category_data[category_name] = df
+    def request_report(self) -> Dict[str, float]:
+        """Request, retry, wait and throughput counters from the most recent load"""
+        return self.metrics.report(self.concurrency)
 
-        return category_data
\ No newline at end of file
+    def timing_report(self) -> pd.DataFrame:
+        """Per-series fetch timings from the most recent load, slowest first"""
+        report = pd.DataFrame(
+            {'seconds': pd.Series(self.timings, dtype=float)}
+        )
+        return report.sort_values('seconds', ascending=False)
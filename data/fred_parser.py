@@ -0,0 +1,82 @@
+import json
+from typing import Tuple
+import numpy as np
+
+# FRED marks a missing observation with a "." value
+MISSING = b'.'
+_QUOTE = ord('"')
+_DATE_WIDTH = 10  # YYYY-MM-DD
+
+
+def _key_values(buffer: np.ndarray, starts: np.ndarray, lengths: np.ndarray, key: bytes) -> np.ndarray:
+    """Token numbers of the string following every `key` token"""
+    candidates = np.flatnonzero(lengths[:-1] == len(key))
+    match = np.ones(len(candidates), dtype=bool)
+    for offset, char in enumerate(key):
+        match &= buffer[starts[candidates] + offset] == char
+    return candidates[match] + 1
+
+
+def _gather(buffer: np.ndarray, starts: np.ndarray, lengths: np.ndarray, width: int) -> np.ndarray:
+    """Strings at (start, length) as a fixed-width bytes array, NUL padded"""
+    columns = np.arange(width)
+    positions = np.minimum(starts[:, np.newaxis] + columns, len(buffer) - 1)
+    chars = np.where(columns < lengths[:, np.newaxis], buffer[positions], 0).astype(np.uint8)
+    return chars.view(f'S{width}').ravel()
+
+
+def _to_arrays(raw_dates: np.ndarray, raw_values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """datetime64[ns] dates and float64 values; missing markers become NaN"""
+    dates = raw_dates.astype('datetime64[D]').astype('datetime64[ns]')
+    missing = (raw_values == MISSING) | (raw_values == b'')
+    values = np.full(len(raw_values), np.nan)
+    values[~missing] = raw_values[~missing].astype(np.float64)
+    return dates, values
+
+
+def _to_float(value: str) -> float:
+    """Observation value as a float; missing markers and anything unparseable become NaN"""
+    try:
+        return float(value)
+    except ValueError:
+        return np.nan
+
+
+def _parse_json(content: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """Reference path through the json module, for payloads the scanner does not accept"""
+    observations = json.loads(content).get('observations') or []
+    dates = np.array([obs['date'][:_DATE_WIDTH] for obs in observations], dtype='datetime64[D]')
+    values = np.array([_to_float(obs['value']) for obs in observations], dtype=np.float64)
+    return dates.astype('datetime64[ns]'), values
+
+
+def parse_observations(content: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """Dates and values of a series/observations JSON response, straight from its bytes.
+
+    Every string in the payload is located from the positions of its quote
+    characters, so no Python object is created per observation. Values of
+    "." (FRED's missing marker) or "" are returned as NaN. Payloads with
+    escapes or unexpected values go through the json module instead.
+    """
+    buffer = np.frombuffer(content, dtype=np.uint8)
+    quotes = np.flatnonzero(buffer == _QUOTE)
+    # Escapes could hide quotes inside strings; FRED observation payloads have none
+    if len(quotes) % 2 or content.find(b'\\') != -1:
+        return _parse_json(content)
+
+    starts = quotes[0::2] + 1
+    lengths = quotes[1::2] - starts
+    date_tokens = _key_values(buffer, starts, lengths, b'date')
+    value_tokens = _key_values(buffer, starts, lengths, b'value')
+    if len(date_tokens) != len(value_tokens) or np.any(lengths[date_tokens] != _DATE_WIDTH):
+        return _parse_json(content)
+    if not len(date_tokens):
+        return np.empty(0, dtype='datetime64[ns]'), np.empty(0)
+
+    value_lengths = lengths[value_tokens]
+    raw_dates = _gather(buffer, starts[date_tokens], lengths[date_tokens], _DATE_WIDTH)
+    raw_values = _gather(buffer, starts[value_tokens], value_lengths, int(value_lengths.max()) or 1)
+    try:
+        return _to_arrays(raw_dates, raw_values)
+    except ValueError:
+        return _parse_json(content)
@@ -0,0 +1,224 @@
+import json
+import random
+import threading
+import time
+import pandas as pd
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+class FREDStubServer:
+    """Local stand-in for the FRED endpoints used by FREDReader.
+
+    Serves series/observations, series and series/updates from in-memory
+    series so refresh logic can be exercised without the real API:
+
+        with FREDStubServer({'DGS10': series}) as server:
+            reader = FREDReader('key', base_url=server.base_url)
+
+    Faults can be injected to exercise retries and rate limiting: a fixed
+    `latency` per request, a server-side limit of `requests_per_second`
+    beyond which requests get 429 with a Retry-After header, and random
+    429s (`throttle_rate`), 503s (`error_rate`) or responses delayed by
+    `stall_seconds` (`stall_rate`). `injected` counts each fault served.
+    """
+
+    def __init__(self, observations: Dict[str, pd.Series], host: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.0, requests_per_second: Optional[float] = None,
+                 throttle_rate: float = 0.0, error_rate: float = 0.0,
+                 stall_rate: float = 0.0, stall_seconds: float = 0.0,
+                 retry_after: float = 1.0, seed: int = 0):
+        self.observations = dict(observations)
+        self.last_updated = {series_id: datetime.now() for series_id in self.observations}
+        self.requests: List[Tuple[str, dict]] = []
+        self.injected = {'throttled': 0, 'errors': 0, 'stalls': 0}
+        self._random = random.Random(seed)
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self.set_faults(
+            latency=latency, requests_per_second=requests_per_second,
+            throttle_rate=throttle_rate, error_rate=error_rate,
+            stall_rate=stall_rate, stall_seconds=stall_seconds, retry_after=retry_after
+        )
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FREDStubServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'FREDStubServer':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def update_series(self, series_id: str, series: pd.Series, updated_at: Optional[datetime] = None):
+        """Replace a series and bump its last_updated stamp"""
+        with self._lock:
+            self.observations[series_id] = series
+            self.last_updated[series_id] = updated_at or datetime.now()
+
+    def set_faults(self, **faults):
+        """Change fault injection settings (same names as the constructor arguments)"""
+        for name, value in faults.items():
+            if name not in ('latency', 'requests_per_second', 'throttle_rate', 'error_rate',
+                            'stall_rate', 'stall_seconds', 'retry_after'):
+                raise ValueError(f"Unknown fault setting: {name}")
+            setattr(self, name, value)
+
+    def _fault(self) -> Optional[Tuple[int, float]]:
+        """(status, delay) of the fault to serve for a request, or None"""
+        with self._lock:
+            if self.requests_per_second is not None:
+                now = time.monotonic()
+                if now - self._window_start >= 1.0:
+                    self._window_start = now
+                    self._window_count = 0
+                self._window_count += 1
+                if self._window_count > self.requests_per_second:
+                    self.injected['throttled'] += 1
+                    return 429, 0.0
+
+            draw = self._random.random()
+            if draw < self.throttle_rate:
+                self.injected['throttled'] += 1
+                return 429, 0.0
+            draw -= self.throttle_rate
+            if draw < self.error_rate:
+                self.injected['errors'] += 1
+                return 503, 0.0
+            draw -= self.error_rate
+            if draw < self.stall_rate:
+                self.injected['stalls'] += 1
+                return 200, self.stall_seconds
+        return None
+
+    def request_paths(self) -> List[str]:
+        """Paths of every request received so far, in order"""
+        with self._lock:
+            return [path for path, _ in self.requests]
+
+    @staticmethod
+    def _format_stamp(stamp: datetime) -> str:
+        return stamp.strftime('%Y-%m-%d %H:%M:%S-05')
+
+    def _observations_payload(self, params: dict) -> Optional[dict]:
+        series = self.observations.get(params.get('series_id'))
+        if series is None:
+            return None
+
+        start = params.get('observation_start')
+        end = params.get('observation_end')
+        if start:
+            series = series[series.index >= pd.Timestamp(start)]
+        if end:
+            series = series[series.index <= pd.Timestamp(end)]
+
+        return {
+            'count': len(series),
+            'observations': [
+                {
+                    'date': date.strftime('%Y-%m-%d'),
+                    'value': '.' if pd.isna(value) else repr(float(value))
+                }
+                for date, value in series.items()
+            ]
+        }
+
+    def _series_payload(self, params: dict) -> Optional[dict]:
+        series_id = params.get('series_id')
+        if series_id not in self.last_updated:
+            return None
+        return {'seriess': [{
+            'id': series_id,
+            'last_updated': self._format_stamp(self.last_updated[series_id])
+        }]}
+
+    def _updates_payload(self, params: dict) -> dict:
+        start = datetime.strptime(params['start_time'], '%Y%m%d%H%M') if 'start_time' in params else None
+        updated = sorted(
+            (
+                (stamp, series_id) for series_id, stamp in self.last_updated.items()
+                if start is None or stamp >= start
+            ),
+            reverse=True
+        )
+        offset = int(params.get('offset', 0))
+        limit = int(params.get('limit', 1000))
+        return {
+            'count': len(updated),
+            'offset': offset,
+            'limit': limit,
+            'seriess': [
+                {'id': series_id, 'last_updated': self._format_stamp(stamp)}
+                for stamp, series_id in updated[offset:offset + limit]
+            ]
+        }
+
+    def _route(self, path: str, params: dict) -> Optional[dict]:
+        with self._lock:
+            self.requests.append((path, params))
+            if path.endswith('/series/observations'):
+                return self._observations_payload(params)
+            if path.endswith('/series/updates'):
+                return self._updates_payload(params)
+            if path.endswith('/series'):
+                return self._series_payload(params)
+        return None
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+                fault = stub._fault()
+                if fault is not None and fault[0] != 200:
+                    status = fault[0]
+                    payload = {'error_code': status, 'error_message': 'Injected fault.'}
+                else:
+                    if fault is not None:
+                        time.sleep(fault[1])
+                    payload = stub._route(url.path, params)
+                    if payload is None:
+                        status, payload = 400, {'error_code': 400, 'error_message': 'Bad Request.'}
+                    else:
+                        status = 200
+
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                if status == 429:
+                    self.send_header('Retry-After', f"{stub.retry_after:g}")
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # The client gave up on a stalled response
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
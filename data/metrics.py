@@ -0,0 +1,172 @@
+import ast
+import graphlib
+import threading
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Optional, Set
+from config.settings import FRED_CONFIG
+from utils.tracing import span
+
+# Functions a formula may call, applied elementwise to whole columns
+FUNCTIONS = {
+    'abs': np.abs,
+    'exp': np.exp,
+    'log': np.log,
+    'sqrt': np.sqrt,
+}
+
+_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.UAdd, ast.USub)
+
+
+def formula_names(formula: str) -> Set[str]:
+    """Series IDs and metrics a formula refers to; ValueError if it is not a plain arithmetic expression"""
+    try:
+        tree = ast.parse(formula, mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"invalid syntax in {formula!r}: {e.msg}") from None
+
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.keywords:
+                raise ValueError(f"unsupported call in {formula!r}; allowed: {', '.join(FUNCTIONS)}")
+        elif isinstance(node, ast.Name):
+            if node.id not in FUNCTIONS:
+                names.add(node.id)
+        elif isinstance(node, ast.Constant):
+            if not isinstance(node.value, (int, float)) or isinstance(node.value, bool):
+                raise ValueError(f"unsupported constant {node.value!r} in {formula!r}")
+        elif not isinstance(node, (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Load) + _OPERATORS):
+            raise ValueError(f"unsupported {type(node).__name__} in {formula!r}")
+    return names
+
+
+class MetricValues:
+    """Derived metric columns computed for one frame; the next evaluation reuses unchanged ones"""
+
+    def __init__(self, index: pd.Index, inputs: Dict[str, np.ndarray], columns: Dict[str, np.ndarray]):
+        self.index = index
+        self.inputs = inputs
+        self.columns = columns
+
+    def join(self, df: pd.DataFrame) -> pd.DataFrame:
+        """`df` with the metric columns added; the input columns are shared, not copied"""
+        result = df.copy(deep=False)
+        for name, values in self.columns.items():
+            result[name] = values
+        return result
+
+
+class MetricGraph:
+    """Derived metrics compiled into a dependency graph.
+
+    Each metric is an arithmetic formula over input series IDs and other
+    metrics. The formulas are parsed and checked once, on construction:
+    unknown names, unsupported syntax and cycles raise a ValueError listing
+    every problem. Evaluation runs the compiled formulas in topological
+    order on the columns' NumPy arrays.
+    """
+
+    def __init__(self, metrics: Dict[str, Dict], inputs: Iterable[str]):
+        self.metrics = metrics
+        self.inputs = list(inputs)
+        self.dependencies: Dict[str, Set[str]] = {}
+        problems = []
+
+        for name, info in metrics.items():
+            if not name.isidentifier():
+                problems.append(f"{name}: metric keys must be identifiers to be used in formulas")
+            if name in self.inputs:
+                problems.append(f"{name}: metric key is also an input series")
+            try:
+                names = formula_names(info['formula'])
+            except ValueError as e:
+                problems.append(f"{name}: {e}")
+                continue
+            unknown = names - set(self.inputs) - set(metrics)
+            if unknown:
+                problems.append(f"{name}: unknown names {', '.join(sorted(unknown))}")
+            self.dependencies[name] = names
+
+        if not problems:
+            try:
+                order = graphlib.TopologicalSorter(
+                    {name: names & set(metrics) for name, names in self.dependencies.items()}
+                ).static_order()
+                self.order: List[str] = list(order)
+            except graphlib.CycleError as e:
+                problems.append(f"circular formulas: {' -> '.join(e.args[1])}")
+
+        if problems:
+            raise ValueError("Invalid calculated_metrics:\n  " + "\n  ".join(problems))
+
+        self.code = {
+            name: compile(metrics[name]['formula'], f"<metric {name}>", 'eval') for name in self.order
+        }
+        # Metric -> metrics computed from it, for propagating changes
+        self.dependents: Dict[str, Set[str]] = {name: set() for name in [*self.inputs, *self.order]}
+        for name, names in self.dependencies.items():
+            for dependency in names:
+                self.dependents[dependency].add(name)
+
+    def affected(self, changed: Iterable[str]) -> Set[str]:
+        """Metrics that depend, directly or through other metrics, on any of `changed`"""
+        affected = set()
+        pending = list(changed)
+        while pending:
+            for dependent in self.dependents.get(pending.pop(), ()):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    pending.append(dependent)
+        return affected
+
+    def evaluate(self, df: pd.DataFrame, previous: Optional[MetricValues] = None) -> MetricValues:
+        """Metric columns for `df`, recomputing only those whose inputs differ from `previous`"""
+        inputs = {
+            name: df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+            for name in self.inputs if name in df.columns
+        }
+        if previous is not None and previous.index.equals(df.index):
+            changed = set(inputs) ^ set(previous.inputs) | {
+                name for name, values in inputs.items()
+                if name in previous.inputs and not np.array_equal(values, previous.inputs[name], equal_nan=True)
+            }
+            stale = self.affected(changed) | (set(self.order) - set(previous.columns))
+        else:
+            stale = set(self.order)
+
+        namespace = dict(inputs)
+        columns = {}
+        with span('metrics.evaluate', metrics=len(stale)), np.errstate(divide='ignore', invalid='ignore'):
+            for name in self.order:
+                if name not in stale:
+                    columns[name] = previous.columns[name]
+                elif self.dependencies[name] <= namespace.keys():
+                    values = eval(self.code[name], {'__builtins__': {}, **FUNCTIONS}, namespace)
+                    values = np.asarray(values, dtype=np.float64)
+                    if values.ndim == 0:
+                        # A constant formula; every metric is a full column
+                        values = np.full(len(df.index), values)
+                    # Division by zero yields inf; treat it as missing, without writing into a shared array
+                    infinite = np.isinf(values)
+                    if infinite.any():
+                        values = np.where(infinite, np.nan, values)
+                    columns[name] = values
+                else:
+                    # An input is missing from this frame; so is everything computed from it
+                    continue
+                namespace[name] = columns[name]
+        return MetricValues(df.index, inputs, columns)
+
+
+_metric_graph: Optional[MetricGraph] = None
+_metric_graph_lock = threading.Lock()
+
+
+def get_metric_graph() -> MetricGraph:
+    """FRED_CONFIG's calculated metrics, compiled (and validated) on first use"""
+    global _metric_graph
+    with _metric_graph_lock:
+        if _metric_graph is None:
+            _metric_graph = MetricGraph(FRED_CONFIG['calculated_metrics'], FRED_CONFIG['required_metrics'])
+        return _metric_graph
@@ -0,0 +1,168 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+from config.settings import FETCH_CONFIG
+
+# Responses worth retrying: throttling and transient server errors
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` requests per second on average.
+
+    Up to `burst` requests may go out back to back; after that callers of
+    `acquire` block until a token has refilled.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Take one token, waiting for it if needed; returns the seconds waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class AdaptiveConcurrency:
+    """Concurrency limit that halves on throttling and grows back by one on success.
+
+    `slot` blocks while `limit` requests are already in flight. Each
+    throttled response halves the limit (down to 1); every `increase_after`
+    consecutive successes raise it by one, up to `max_limit`.
+    """
+
+    def __init__(self, max_limit: int, increase_after: int = FETCH_CONFIG['concurrency_increase_after']):
+        self.max_limit = max_limit
+        self.limit = max_limit
+        self.increase_after = increase_after
+        self.min_seen = max_limit
+        self._in_flight = 0
+        self._successes = 0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def slot(self):
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def on_success(self):
+        with self._condition:
+            self._successes += 1
+            if self._successes >= self.increase_after and self.limit < self.max_limit:
+                self.limit += 1
+                self._successes = 0
+                self._condition.notify_all()
+
+    def on_throttle(self):
+        with self._condition:
+            self.limit = max(1, self.limit // 2)
+            self.min_seen = min(self.min_seen, self.limit)
+            self._successes = 0
+
+
+def backoff_delay(attempt: int, base: float = FETCH_CONFIG['backoff_base_seconds'],
+                  cap: float = FETCH_CONFIG['backoff_max_seconds'],
+                  retry_after: Optional[float] = None) -> float:
+    """Seconds to wait before retry number `attempt` (0-based).
+
+    Full jitter: uniform between 0 and the capped exponential step, so
+    concurrent clients do not retry in lockstep. A server Retry-After
+    value is honoured as a lower bound.
+    """
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, cap))
+    return delay
+
+
+class RequestMetrics:
+    """Counters for the requests of one refresh"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.successes = 0
+        self.retries = 0
+        self.throttled = 0
+        self.server_errors = 0
+        self.timeouts = 0
+        self.failures = 0
+        self.rate_wait_seconds = 0.0
+        self.backoff_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def report(self, concurrency: Optional[AdaptiveConcurrency] = None) -> Dict[str, float]:
+        """Counters plus throughput (successful requests per second) since creation"""
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            report = {
+                'requests': self.requests,
+                'successes': self.successes,
+                'retries': self.retries,
+                'throttled': self.throttled,
+                'server_errors': self.server_errors,
+                'timeouts': self.timeouts,
+                'failures': self.failures,
+                'rate_wait_seconds': round(self.rate_wait_seconds, 3),
+                'backoff_seconds': round(self.backoff_seconds, 3),
+                'throughput_per_second': round(self.successes / elapsed, 2) if elapsed > 0 else 0.0
+            }
+        if concurrency is not None:
+            report['concurrency_limit'] = concurrency.limit
+            report['concurrency_min'] = concurrency.min_seen
+        return report
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_concurrency: Dict[str, AdaptiveConcurrency] = {}
+_registry_lock = threading.Lock()
+
+
+def get_rate_limiter(base_url: str) -> TokenBucket:
+    """The token bucket shared by every reader of an API in this process"""
+    with _registry_lock:
+        if base_url not in _limiters:
+            _limiters[base_url] = TokenBucket(
+                FETCH_CONFIG['requests_per_minute'] / 60, FETCH_CONFIG['burst']
+            )
+        return _limiters[base_url]
+
+
+def get_concurrency(base_url: str) -> AdaptiveConcurrency:
+    """The adaptive concurrency limit shared by every reader of an API in this process"""
+    with _registry_lock:
+        if base_url not in _concurrency:
+            _concurrency[base_url] = AdaptiveConcurrency(FETCH_CONFIG['max_workers'])
+        return _concurrency[base_url]
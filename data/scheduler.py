@@ -0,0 +1,335 @@
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Set
+from config.settings import FRED_CONFIG, REFRESH_CONFIG, STORE_CONFIG
+from data.cache import ObservationCache
+from data.fred_api import FREDReader
+from data.series_store import SeriesStore
+from data.shared_store import SharedDataStore
+
+try:
+    import fcntl
+except ImportError:  # No cross-process lock; every process refreshes
+    fcntl = None
+
+
+def _same_data(left: pd.Series, right: pd.Series) -> bool:
+    return (len(left) == len(right)
+            and np.array_equal(left.index.values, right.index.values)
+            and np.array_equal(left.to_numpy(), right.to_numpy()))
+
+
+class RefreshScheduler:
+    """Background thread keeping the shared store current on a per-series schedule.
+
+    A series is due when its cached observations are older than its
+    refresh interval: the series' 'cache_ttl_hours' in FRED_CONFIG, or
+    REFRESH_CONFIG['intervals_hours'] for its native frequency. Due series
+    are validated and fetched through the observation cache, and changed
+    data is published to the shared store as a new snapshot, so page
+    scripts only ever read local data.
+
+    With several server processes, one holds the lock file and refreshes;
+    the others serve its snapshots and forward refresh requests through a
+    trigger file.
+    """
+
+    def __init__(self, shared_store: SharedDataStore, cache: ObservationCache,
+                 config: Dict = FRED_CONFIG, base_url: Optional[str] = None,
+                 tick_seconds: float = REFRESH_CONFIG['tick_seconds'],
+                 lock_path: Optional[str] = REFRESH_CONFIG['lock_path']):
+        self.shared_store = shared_store
+        self.cache = cache
+        self.config = config
+        self.base_url = base_url
+        self.tick_seconds = tick_seconds
+        self.lock_path = lock_path
+        self.series_info = {
+            series_id: info
+            for series_dict in config['series'].values()
+            for series_id, info in series_dict.items()
+        }
+
+        self.is_leader = False
+        self.running = False
+        # Offline: no FRED requests; series missing from the store are still loaded from the cache
+        self.offline = False
+        self.runs = 0
+        self.last_run: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        self.last_published: Optional[float] = None
+        self.last_report: Dict[str, float] = {}
+        self.last_timings = pd.DataFrame()
+        self.errors: Dict[str, str] = {}
+        # Download time of each series, re-read once per tick; status reads come from here
+        self._fetched_at: Optional[Dict[str, Optional[float]]] = None
+        self._retry_at: Dict[str, float] = {}
+        self._forced: Set[str] = set()
+        self._trigger_seen: Optional[float] = None
+        self._lock_handle = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # Schedule
+
+    def frequency(self, series_id: str) -> str:
+        store = self.shared_store.series_store
+        if store is not None and series_id in store:
+            return store.frequency(series_id)
+        return 'Unknown'
+
+    def interval_seconds(self, series_id: str) -> float:
+        """Refresh interval of a series: its cache TTL override, else by native frequency"""
+        info = self.series_info[series_id]
+        if 'cache_ttl_hours' in info:
+            return info['cache_ttl_hours'] * 3600
+        intervals = REFRESH_CONFIG['intervals_hours']
+        return intervals.get(self.frequency(series_id), intervals['Unknown']) * 3600
+
+    def next_due(self, series_id: str) -> float:
+        """Unix time the series is next due; now or earlier if never cached"""
+        info = self.series_info[series_id]
+        return self._due_at(series_id, self.cache.fetched_at(series_id, info.get('units', 'lin')))
+
+    def _due_at(self, series_id: str, fetched_at: Optional[float]) -> float:
+        if series_id in self._forced:
+            return 0.0
+        due = (fetched_at or 0.0) + self.interval_seconds(series_id)
+        return max(due, self._retry_at.get(series_id, 0.0))
+
+    def due_series(self, now: Optional[float] = None) -> List[str]:
+        now = time.time() if now is None else now
+        return [series_id for series_id in self.series_info if self.next_due(series_id) <= now]
+
+    def set_offline(self, offline: bool):
+        """Pause (or resume) network refreshes in this process"""
+        self.offline = offline
+        if not offline:
+            self._wake.set()
+
+    def request_refresh(self, series_ids: Optional[List[str]] = None):
+        """Make series (all by default) due now and wake the worker; never blocks"""
+        series_ids = list(series_ids or self.series_info)
+        if self.is_leader or self.lock_path is None:
+            with self._lock:
+                self._forced.update(series_ids)
+            self._wake.set()
+        else:
+            trigger = self.lock_path + '.request'
+            os.makedirs(os.path.dirname(os.path.abspath(trigger)), exist_ok=True)
+            with open(trigger, 'a'):
+                os.utime(trigger)
+
+    # Worker
+
+    def _acquire_leadership(self) -> bool:
+        if self.is_leader or self.lock_path is None or fcntl is None:
+            self.is_leader = True
+            return True
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.lock_path)), exist_ok=True)
+        handle = open(self.lock_path, 'a')
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        self._lock_handle = handle
+        self.is_leader = True
+        return True
+
+    def _check_trigger(self):
+        """Force a full refresh when another process touched the trigger file"""
+        try:
+            stamp = os.stat(self.lock_path + '.request').st_mtime
+        except (OSError, TypeError):
+            stamp = 0.0
+        # Requests made before this process became the leader were already served
+        if self._trigger_seen is not None and stamp > self._trigger_seen:
+            with self._lock:
+                self._forced.update(self.series_info)
+        self._trigger_seen = stamp
+
+    def run_once(self) -> List[str]:
+        """Refresh every due series and publish changes; returns the ids published"""
+        due = [] if self.offline else self.due_series()
+        # Series missing from the published store are loaded too, from the cache when fresh
+        current = self.shared_store.series_store
+        missing = [
+            series_id for series_id in self.series_info
+            if series_id not in due and (current is None or series_id not in current)
+        ]
+        if not due and (not missing or self.runs):
+            return []
+
+        start = time.time()
+        with self._lock:
+            forced = self._forced & set(due)
+            self._forced -= forced
+
+        # The schedule interval doubles as the cache TTL; forced series are always re-checked
+        infos = {
+            series_id: dict(
+                self.series_info[series_id],
+                cache_ttl_hours=0 if series_id in forced else self.interval_seconds(series_id) / 3600
+            )
+            for series_id in due + missing
+        }
+        kwargs = {'base_url': self.base_url} if self.base_url else {}
+        reader = FREDReader(FRED_CONFIG['api_key'], cache=self.cache, offline=self.offline, **kwargs)
+        if not self.offline:
+            reader.preflight(infos)
+        results, errors = reader.fetch_many(infos)
+
+        retry_at = time.time() + REFRESH_CONFIG['retry_minutes'] * 60
+        for series_id in due:
+            if series_id in errors:
+                self.errors[series_id] = errors[series_id]
+                self._retry_at[series_id] = retry_at
+            else:
+                self.errors.pop(series_id, None)
+                self._retry_at.pop(series_id, None)
+
+        published = self._publish(results)
+
+        self.runs += 1
+        self.last_run = start
+        self.last_duration = time.time() - start
+        self.last_report = reader.request_report()
+        self.last_timings = reader.timing_report()
+        self._read_fetched_times()
+        return published
+
+    def _publish(self, results: Dict[str, pd.Series]) -> List[str]:
+        """Publish a new store if any refreshed series differs from the current one"""
+        current = self.shared_store.series_store
+        changed = [
+            series_id for series_id, series in results.items()
+            if current is None or series_id not in current
+            or not _same_data(series, current.series(series_id))
+        ]
+        if not changed:
+            return []
+
+        def load():
+            latest = self.shared_store.series_store
+            series = {series_id: latest.series(series_id) for series_id in latest.series_ids} if latest else {}
+            series.update(results)
+            return SeriesStore.from_series(series, self.config, dtype=STORE_CONFIG['dtype'])
+
+        # Never reuse a concurrent refresh: it may predate these results
+        if self.shared_store.refresh(load, reuse_concurrent=False) is not None:
+            self.last_published = time.time()
+        return changed
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self._acquire_leadership():
+                self._check_trigger()
+                try:
+                    self.run_once()
+                except Exception as e:
+                    self.errors['scheduler'] = str(e)
+            else:
+                self.shared_store.sync()
+                # The leader process refreshes the shared cache; pick up its download times
+                self._read_fetched_times()
+            self._wake.wait(self.tick_seconds)
+            self._wake.clear()
+
+    def start(self) -> 'RefreshScheduler':
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='fred-refresh', daemon=True)
+            self._thread.start()
+            self.running = True
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.running = False
+        if self._lock_handle is not None:
+            self._lock_handle.close()
+            self._lock_handle = None
+            self.is_leader = False
+
+    # Status
+
+    def _read_fetched_times(self):
+        fetched = self.cache.fetched_times()
+        self._fetched_at = {
+            series_id: fetched.get((series_id, info.get('units', 'lin')))
+            for series_id, info in self.series_info.items()
+        }
+
+    def fetched_times(self) -> Dict[str, Optional[float]]:
+        """Last download time per series, as of the latest scheduler tick"""
+        if self._fetched_at is None:
+            self._read_fetched_times()
+        return self._fetched_at
+
+    def _is_stale(self, series_id: str, fetched_at: Optional[float], now: float) -> bool:
+        limit = self.interval_seconds(series_id) * REFRESH_CONFIG['stale_factor']
+        return fetched_at is None or now - fetched_at > limit
+
+    def series_status(self, now: Optional[float] = None) -> pd.DataFrame:
+        """Per-series frequency, interval, last refresh, next refresh and staleness"""
+        now = time.time() if now is None else now
+        records = []
+        for series_id, fetched_at in self.fetched_times().items():
+            info = self.series_info[series_id]
+            interval = self.interval_seconds(series_id)
+            age = now - fetched_at if fetched_at else None
+            records.append({
+                'series_id': series_id,
+                'name': info['name'],
+                'frequency': self.frequency(series_id),
+                'interval_hours': interval / 3600,
+                'refreshed_hours_ago': age / 3600 if age is not None else np.nan,
+                'next_refresh_in_hours': max(self._due_at(series_id, fetched_at) - now, 0) / 3600,
+                'stale': self._is_stale(series_id, fetched_at, now),
+                'error': self.errors.get(series_id, '')
+            })
+        return pd.DataFrame.from_records(records).set_index('series_id')
+
+    def status(self) -> dict:
+        """Worker state and last run summary; cheap enough to poll from every session"""
+        now = time.time()
+        return {
+            'running': self.running,
+            'offline': self.offline,
+            'is_leader': self.is_leader,
+            'runs': self.runs,
+            'last_run': self.last_run,
+            'last_duration': self.last_duration,
+            'last_published': self.last_published,
+            'pending': len(self._forced),
+            'errors': len(self.errors),
+            'stale': sum(
+                self._is_stale(series_id, fetched_at, now)
+                for series_id, fetched_at in self.fetched_times().items()
+            )
+        }
+
+
+_scheduler: Optional[RefreshScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def start_refresh_scheduler(shared_store: SharedDataStore, cache: ObservationCache) -> RefreshScheduler:
+    """Start the process-wide refresh scheduler once and return it"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RefreshScheduler(shared_store, cache)
+            if REFRESH_CONFIG['enabled']:
+                _scheduler.start()
+        return _scheduler
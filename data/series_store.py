@@ -0,0 +1,306 @@
+import hashlib
+import threading
+from concurrent.futures import Future
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+from config.settings import STORE_CONFIG
+from utils.tracing import span
+
+# Native frequency label from the median spacing of observations, in days
+_FREQUENCY_SPACING = [(1.5, 'Daily'), (8, 'Weekly'), (35, 'Monthly'), (100, 'Quarterly')]
+
+
+class AlignedStore:
+    """Several series on one shared date grid.
+
+    One sorted date index is shared by all series. Values and validity
+    flags are 2-D arrays with one contiguous row per series. Series of a
+    category occupy adjacent rows, so a category is one row slice.
+    Built on demand from a SeriesStore by `aligned`.
+    """
+
+    def __init__(self, dates: np.ndarray, values: np.ndarray, valid: np.ndarray,
+                 series_ids: List[str], categories: Dict[str, List[str]]):
+        self.dates = dates
+        self.values = values
+        self.valid = valid
+        self.series_ids = list(series_ids)
+        self.index = {series_id: row for row, series_id in enumerate(self.series_ids)}
+
+        # Category -> (first row, end row); rows are laid out category by category
+        self.categories = {}
+        for category, ids in categories.items():
+            rows = [self.index[series_id] for series_id in ids]
+            if rows:
+                self.categories[category] = (min(rows), max(rows) + 1)
+
+    @classmethod
+    def from_series(cls, series: Dict[str, pd.Series], config: Dict,
+                    dtype=np.float64) -> 'AlignedStore':
+        """Align {series_id: series} on the union of their dates, grouped as in FRED_CONFIG['series']"""
+        categories = {
+            category: [series_id for series_id in series_dict if series_id in series]
+            for category, series_dict in config['series'].items()
+        }
+        series_ids = [series_id for ids in categories.values() for series_id in ids]
+
+        dates = np.unique(np.concatenate(
+            [series[series_id].index.values.astype('datetime64[ns]') for series_id in series_ids]
+        )) if series_ids else np.empty(0, dtype='datetime64[ns]')
+
+        values = np.full((len(series_ids), len(dates)), np.nan, dtype=dtype)
+        for row, series_id in enumerate(series_ids):
+            data = series[series_id]
+            positions = np.searchsorted(dates, data.index.values.astype('datetime64[ns]'))
+            values[row, positions] = data.to_numpy(dtype=dtype)
+        valid = ~np.isnan(values)
+
+        return cls(dates, values, valid, series_ids, categories)
+
+    def __contains__(self, series_id: str) -> bool:
+        return series_id in self.index
+
+    def category_ids(self, category: str) -> List[str]:
+        """Series ids of a category, in configuration order"""
+        if category not in self.categories:
+            return []
+        start, end = self.categories[category]
+        return self.series_ids[start:end]
+
+    def category_frame(self, category: str) -> pd.DataFrame:
+        """Date-indexed DataFrame of a category, trimmed to rows with data"""
+        start, end = self.categories[category]
+        used = self.valid[start:end].any(axis=0)
+        return pd.DataFrame(
+            self.values[start:end, used].T,
+            index=pd.DatetimeIndex(self.dates[used], name='date'),
+            columns=self.series_ids[start:end]
+        )
+
+    def series(self, series_id: str) -> pd.Series:
+        """Valid values of a series on the grid (the equivalent of df[series_id].dropna())"""
+        row = self.index[series_id]
+        mask = self.valid[row]
+        return pd.Series(
+            self.values[row, mask],
+            index=pd.DatetimeIndex(self.dates[mask], name='date'),
+            name=series_id
+        )
+
+    def memory_usage(self) -> int:
+        """Bytes held by the date index, values and validity arrays"""
+        return int(self.dates.nbytes + self.values.nbytes + self.valid.nbytes)
+
+
+class RecentMemo:
+    """Bounded LRU of derived values whose keys vary with user input, such as slider ranges"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SeriesStore:
+    """In-memory store holding every loaded series at its native frequency.
+
+    Observations of all series are concatenated into one date array and one
+    value array; series `i` occupies positions offsets[i]:offsets[i + 1],
+    sorted by date and without missing values. Nothing is padded to a
+    common calendar: grids for charts, tables and signals are built on
+    demand with `aligned` and cached on the store.
+    """
+
+    def __init__(self, dates: np.ndarray, values: np.ndarray, offsets: np.ndarray,
+                 series_ids: List[str], categories: Dict[str, List[str]],
+                 aggregations: Optional[Dict[str, str]] = None):
+        self.dates = dates
+        self.values = values
+        self.offsets = offsets
+        self.series_ids = list(series_ids)
+        self.index = {series_id: row for row, series_id in enumerate(self.series_ids)}
+        # How each series is combined into coarser periods by `aligned`
+        self.aggregations = {
+            series_id: (aggregations or {}).get(series_id, STORE_CONFIG['aggregation'])
+            for series_id in self.series_ids
+        }
+        self.category_members = {
+            category: [series_id for series_id in ids if series_id in self.index]
+            for category, ids in categories.items()
+        }
+        self.categories = {
+            category: ids for category, ids in self.category_members.items() if ids
+        }
+
+        self._memo: Dict[Hashable, Future] = {}
+        self._memo_lock = threading.Lock()
+
+    @classmethod
+    def from_series(cls, series: Dict[str, pd.Series], config: Dict,
+                    dtype=np.float64) -> 'SeriesStore':
+        """Build a store from {series_id: series}, grouped as in FRED_CONFIG['series']"""
+        categories = {
+            category: [series_id for series_id in series_dict if series_id in series]
+            for category, series_dict in config['series'].items()
+        }
+        series_ids = [series_id for ids in categories.values() for series_id in ids]
+        aggregations = {
+            series_id: info['aggregation']
+            for series_dict in config['series'].values()
+            for series_id, info in series_dict.items()
+            if 'aggregation' in info
+        }
+
+        parts = []
+        for series_id in series_ids:
+            data = series[series_id].dropna().sort_index()
+            parts.append(data[~data.index.duplicated(keep='last')])
+
+        lengths = [len(data) for data in parts]
+        offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+        if parts:
+            dates = np.concatenate([data.index.values.astype('datetime64[ns]') for data in parts])
+            values = np.concatenate([data.to_numpy(dtype=dtype) for data in parts])
+        else:
+            dates = np.empty(0, dtype='datetime64[ns]')
+            values = np.empty(0, dtype=dtype)
+
+        return cls(dates, values, offsets, series_ids, categories, aggregations)
+
+    def memo(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Compute a value derived from this store once and reuse it.
+
+        A store is never modified after it is built, so derived results stay
+        valid for its lifetime and are shared by every session reading it.
+        Only the lookup is serialized: `compute` runs outside the lock, and
+        callers asking for the same key meanwhile wait for that result.
+        """
+        with self._memo_lock:
+            future = self._memo.get(key)
+            owner = future is None
+            if owner:
+                future = self._memo[key] = Future()
+
+        if owner:
+            try:
+                future.set_result(compute())
+            except BaseException as e:
+                # Let a later call try again rather than caching the failure
+                with self._memo_lock:
+                    del self._memo[key]
+                future.set_exception(e)
+        return future.result()
+
+    def memo_recent(self, name: str, key: Hashable, compute: Callable[[], Any], max_entries: int) -> Any:
+        """Like `memo`, keeping only the `max_entries` most recently used keys under `name`.
+
+        For values keyed by widget input: sessions can visit any number of
+        slider positions, and `memo` would keep every one for the store's
+        lifetime.
+        """
+        return self.memo(('recent', name), lambda: RecentMemo(max_entries)).get_or_compute(key, compute)
+
+    def fingerprint(self) -> str:
+        """Digest of every series id, date and value, computed once per store"""
+        def compute():
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update('\0'.join(self.series_ids).encode())
+            digest.update(np.ascontiguousarray(self.offsets).tobytes())
+            digest.update(np.ascontiguousarray(self.dates).tobytes())
+            digest.update(np.ascontiguousarray(self.values).tobytes())
+            return digest.hexdigest()
+
+        return self.memo('fingerprint', compute)
+
+    def __contains__(self, series_id: str) -> bool:
+        return series_id in self.index
+
+    def category_ids(self, category: str) -> List[str]:
+        """Series ids of a category, in configuration order"""
+        return list(self.categories.get(category, []))
+
+    def _bounds(self, series_id: str):
+        row = self.index[series_id]
+        return self.offsets[row], self.offsets[row + 1]
+
+    def series(self, series_id: str) -> pd.Series:
+        """Observations of a series at its native frequency"""
+        start, end = self._bounds(series_id)
+        return pd.Series(
+            self.values[start:end],
+            index=pd.DatetimeIndex(self.dates[start:end], name='date'),
+            name=series_id
+        )
+
+    def valid_count(self, series_id: str) -> int:
+        start, end = self._bounds(series_id)
+        return int(end - start)
+
+    def date_range(self):
+        """First and last observation date over all series, or (None, None) when empty"""
+        if not len(self.dates):
+            return None, None
+        return self.dates.min(), self.dates.max()
+
+    def frequency(self, series_id: str) -> str:
+        """Native frequency label inferred from the median spacing of observations"""
+        start, end = self._bounds(series_id)
+        if end - start < 2:
+            return 'Unknown'
+        spacing = np.median(np.diff(self.dates[start:end]) / np.timedelta64(1, 'D'))
+        for limit, label in _FREQUENCY_SPACING:
+            if spacing <= limit:
+                return label
+        return 'Annual'
+
+    def aligned(self, freq: Optional[str] = None, how: Optional[str] = None,
+                series_ids: Optional[Sequence[str]] = None) -> AlignedStore:
+        """Series resampled to `freq` on one grid, cached per (series set, freq, aggregation).
+
+        With freq=None the grid is the union of the native observation
+        dates. Otherwise each series is aggregated into `freq` periods with
+        `how` ('last', 'mean', 'sum', ...), or its own configured
+        aggregation when None; periods without observations stay invalid.
+        """
+        series_ids = tuple(series_ids) if series_ids is not None else tuple(self.series_ids)
+
+        def compute():
+            resampled = {}
+            for series_id in series_ids:
+                series = self.series(series_id)
+                if freq is not None:
+                    with span('store.resample', series_id=series_id, freq=freq):
+                        series = series.resample(freq).agg(how or self.aggregations[series_id])
+                resampled[series_id] = series
+            return AlignedStore.from_series(
+                resampled, {'series': self.category_members}, dtype=self.values.dtype
+            )
+
+        return self.memo(('aligned', series_ids, freq, how), compute)
+
+    def category_frame(self, category: str, freq: Optional[str] = None) -> pd.DataFrame:
+        """Date-indexed DataFrame of a category at `freq` (the native dates when None)"""
+        return self.aligned(freq, series_ids=self.category_ids(category)).category_frame(category)
+
+    def memory_usage(self) -> int:
+        """Bytes held by the observation dates, values and offsets"""
+        return int(self.dates.nbytes + self.values.nbytes + self.offsets.nbytes)
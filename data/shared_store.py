@@ -0,0 +1,117 @@
+import threading
+import time
+from typing import Callable, Optional
+from config.settings import STORE_CONFIG
+from data.series_store import SeriesStore
+from data.snapshot import read_snapshot, snapshot_identity, write_snapshot
+
+
+class SharedDataStore:
+    """Process-wide series data shared by every Streamlit session.
+
+    Sessions hold references to the published SeriesStore instead of their
+    own copies. A published store is never mutated; a refresh publishes a
+    new one, so readers need no lock.
+
+    With a snapshot path, refreshed data is written to a memory-mapped
+    snapshot file and served from it, and other server processes pick up
+    that file through `sync` without parsing anything.
+    """
+
+    def __init__(self, snapshot_path: Optional[str] = None):
+        self.snapshot_path = snapshot_path
+        self._snapshot_identity = None
+        self.series_store: Optional[SeriesStore] = None
+        self.version = 0
+        self.loaded_at: Optional[float] = None
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def get(self) -> Optional[SeriesStore]:
+        """Current shared data, or None if nothing has been loaded yet"""
+        data = self.series_store
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def publish(self, series_store: SeriesStore):
+        """Replace the shared data for all sessions"""
+        with self._lock:
+            self.series_store = series_store
+            self.version += 1
+            self.loaded_at = time.time()
+
+    def refresh(self, load: Callable[[], Optional[SeriesStore]],
+                reuse_concurrent: bool = True) -> Optional[SeriesStore]:
+        """Run `load` and publish its result, one refresh at a time.
+
+        A session that waited on another session's refresh reuses that
+        result instead of loading again, unless `reuse_concurrent` is False.
+        """
+        version = self.version
+        with self._refresh_lock:
+            if reuse_concurrent and self.version != version:
+                return self.series_store
+
+            series_store = load()
+            if series_store is not None and series_store.series_ids:
+                if self.snapshot_path:
+                    write_snapshot(series_store, self.snapshot_path)
+                    self._snapshot_identity = snapshot_identity(self.snapshot_path)
+                    series_store = read_snapshot(self.snapshot_path)
+                self.publish(series_store)
+                with self._lock:
+                    self.refreshes += 1
+                return series_store
+            return None
+
+    def sync(self) -> bool:
+        """Publish the snapshot file if another process replaced it; True if published"""
+        if not self.snapshot_path:
+            return False
+
+        identity = snapshot_identity(self.snapshot_path)
+        if identity is None or identity == self._snapshot_identity:
+            return False
+
+        with self._refresh_lock:
+            if identity == self._snapshot_identity:
+                return False
+            try:
+                series_store = read_snapshot(self.snapshot_path)
+            except (OSError, ValueError):
+                return False
+            self._snapshot_identity = identity
+            self.publish(series_store)
+            return True
+
+    def memory_usage(self) -> int:
+        """Bytes held by the shared series store"""
+        data = self.series_store
+        return data.memory_usage() if data is not None else 0
+
+    def stats(self) -> dict:
+        """Version, hit/miss counters and memory use of the shared data"""
+        with self._lock:
+            return {
+                'version': self.version,
+                'loaded_at': self.loaded_at,
+                'hits': self.hits,
+                'misses': self.misses,
+                'refreshes': self.refreshes,
+                'memory_bytes': self.memory_usage()
+            }
+
+
+_shared_store = SharedDataStore(STORE_CONFIG['snapshot_path'])
+
+
+def get_shared_store() -> SharedDataStore:
+    """The store shared by every session in this process"""
+    return _shared_store
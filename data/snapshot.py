@@ -0,0 +1,112 @@
+import json
+import os
+import struct
+import tempfile
+import time
+import numpy as np
+from data.series_store import SeriesStore
+
+# File layout: magic, format version, header length, JSON header, then the
+# observation dates, values and per-series offsets, each aligned to ALIGNMENT bytes.
+MAGIC = b'FREDSNAP'
+VERSION = 2
+ALIGNMENT = 64
+_PREAMBLE = struct.Struct('<8sII')
+
+
+def _aligned(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_snapshot(store: SeriesStore, path: str):
+    """Write a store to `path` atomically.
+
+    The file is written under a temporary name in the same directory,
+    flushed to disk and then renamed over `path`, so readers only ever see
+    a complete previous or complete new snapshot.
+    """
+    arrays = {
+        'dates': np.ascontiguousarray(store.dates, dtype='datetime64[ns]'),
+        'values': np.ascontiguousarray(store.values),
+        'offsets': np.ascontiguousarray(store.offsets, dtype=np.int64)
+    }
+
+    header = {
+        'series_ids': store.series_ids,
+        'categories': store.category_members,
+        'aggregations': store.aggregations,
+        'created_at': time.time(),
+        'arrays': {}
+    }
+
+    # Offsets depend on the header length, so size the header with placeholders first
+    for name, array in arrays.items():
+        header['arrays'][name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': 0}
+    header_length = len(json.dumps(header).encode()) + 32 * len(arrays)
+    offset = _aligned(_PREAMBLE.size + header_length)
+    for name, array in arrays.items():
+        header['arrays'][name]['offset'] = offset
+        offset = _aligned(offset + array.nbytes)
+
+    header_bytes = json.dumps(header).encode().ljust(header_length)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.snapshot-')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(_PREAMBLE.pack(MAGIC, VERSION, header_length))
+            handle.write(header_bytes)
+            for name, array in arrays.items():
+                handle.seek(header['arrays'][name]['offset'])
+                handle.write(array.tobytes())
+            handle.truncate(offset)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.chmod(temp_path, 0o644)  # mkstemp creates owner-only files
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def read_snapshot(path: str) -> SeriesStore:
+    """Open a snapshot as a SeriesStore backed by read-only memory maps.
+
+    Nothing is parsed or copied: the OS shares the mapped pages between
+    every process that opens the same file.
+    """
+    with open(path, 'rb') as handle:
+        magic, version, header_length = _PREAMBLE.unpack(handle.read(_PREAMBLE.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} series snapshot")
+        header = json.loads(handle.read(header_length))
+
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        shape = tuple(spec['shape'])
+        if 0 in shape:
+            arrays[name] = np.empty(shape, dtype=spec['dtype'])
+        else:
+            mapped = np.memmap(path, dtype=spec['dtype'], mode='r', offset=spec['offset'], shape=shape)
+            # A plain ndarray view keeps the mapping alive without memmap subclass results
+            arrays[name] = mapped.view(np.ndarray)
+
+    return SeriesStore(
+        arrays['dates'],
+        arrays['values'],
+        arrays['offsets'],
+        header['series_ids'],
+        header['categories'],
+        header['aggregations']
+    )
+
+
+def snapshot_identity(path: str):
+    """(inode, mtime) of the snapshot file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
@@ -0,0 +1,186 @@
+import time
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from config.settings import (
+    CACHE_CONFIG, DCF_CONFIG, ENGINE_CONFIG, FRED_CONFIG, MONTE_CARLO_CONFIG, STORE_CONFIG
+)
+from data.cache import ObservationCache
+from data.fred_api import FREDReader
+from data.series_store import SeriesStore
+from data.shared_store import SharedDataStore, get_shared_store
+from engine.results import ResultStore, frame_to_json, signal_frame
+from models.dcf_model import DCFModel
+from models.monte_carlo import MonteCarloDCF
+from utils.progress import Reporter
+from utils.tracing import span
+
+STEPS = ['refresh', 'signals', 'dcf']
+
+
+class BatchEngine:
+    """Refresh, signals and valuations without a Streamlit runtime.
+
+    Runs the same readers and models as the pages, reports progress through
+    a Reporter and writes everything to a ResultStore. Refreshed data is
+    published through the shared store's snapshot, which running app
+    processes pick up, and the pages read the precomputed results instead
+    of computing them per request.
+    """
+
+    def __init__(self, results: Optional[ResultStore] = None, reporter: Optional[Reporter] = None,
+                 cache: Optional[ObservationCache] = None,
+                 shared_store: Optional[SharedDataStore] = None,
+                 base_url: Optional[str] = None, offline: bool = False, config: Dict = FRED_CONFIG):
+        self.results = results or ResultStore()
+        self.reporter = reporter or Reporter()
+        self.cache = cache or ObservationCache(
+            CACHE_CONFIG['path'], default_ttl_hours=CACHE_CONFIG['default_ttl_hours']
+        )
+        self.shared_store = shared_store or get_shared_store()
+        self.base_url = base_url
+        self.offline = offline
+        self.config = config
+        self.timings: Dict[str, float] = {}
+        self.request_report: Dict[str, float] = {}
+
+    def _reader(self) -> FREDReader:
+        kwargs = {'base_url': self.base_url} if self.base_url else {}
+        return FREDReader(
+            self.config['api_key'], cache=self.cache, offline=self.offline,
+            reporter=self.reporter, **kwargs
+        )
+
+    def refresh(self) -> Optional[SeriesStore]:
+        """Fetch every configured series and publish them as the shared store"""
+        reader = self._reader()
+        series_store = self.shared_store.refresh(
+            lambda: SeriesStore.from_series(
+                reader.load_all_series(self.config), self.config, dtype=STORE_CONFIG['dtype']
+            ),
+            reuse_concurrent=False
+        )
+        self.request_report = reader.request_report()
+        return series_store
+
+    def load_store(self) -> Optional[SeriesStore]:
+        """The published store, or the local cache's data when nothing is published"""
+        self.shared_store.sync()
+        if self.shared_store.series_store is not None:
+            return self.shared_store.series_store
+
+        offline, self.offline = self.offline, True
+        try:
+            return self.refresh()
+        finally:
+            self.offline = offline
+
+    def dcf_inputs(self) -> Optional[pd.DataFrame]:
+        """Quarterly corporate profit history used by the DCF models"""
+        inputs = DCF_CONFIG['inputs']
+        reader = self._reader()
+        results, errors = reader.fetch_many({info['series_id']: info for info in inputs.values()})
+        for series_id, error in errors.items():
+            self.reporter.error(f"Error fetching {series_id}: {error}")
+
+        columns = {
+            column: results[info['series_id']]
+            for column, info in inputs.items() if info['series_id'] in results
+        }
+        if len(columns) < len(inputs):
+            return None
+        return pd.concat(columns, axis=1).dropna()
+
+    def compute_dcf(self, financial_data: pd.DataFrame, monte_carlo: bool = False) -> Optional[dict]:
+        """DCF valuation, sensitivity grid and optionally the Monte Carlo distribution"""
+        model = DCFModel(
+            financial_data, DCF_CONFIG['wacc'], DCF_CONFIG['terminal_growth'],
+            DCF_CONFIG['forecast_years'], reporter=self.reporter
+        )
+        output = model.calculate_dcf()
+        if output is None:
+            return None
+
+        grid, wacc_range, growth_range = model.sensitivity_analysis(
+            DCF_CONFIG['sensitivity_points'], DCF_CONFIG['sensitivity_spread']
+        )
+        result = {
+            'parameters': {
+                'wacc': DCF_CONFIG['wacc'],
+                'terminal_growth': DCF_CONFIG['terminal_growth'],
+                'forecast_years': DCF_CONFIG['forecast_years']
+            },
+            'enterprise_value': output['enterprise_value'],
+            'terminal_value': output['terminal_value'],
+            'terminal_value_pv': output['terminal_value_pv'],
+            'present_values': output['present_values'],
+            'forecast': frame_to_json(output['forecast']),
+            'sensitivity': frame_to_json(pd.DataFrame(
+                grid,
+                index=pd.Index(np.round(wacc_range, 4), name='wacc'),
+                columns=np.round(growth_range, 4)
+            ))
+        }
+
+        if monte_carlo:
+            simulation = MonteCarloDCF(
+                financial_data, DCF_CONFIG['wacc'], DCF_CONFIG['terminal_growth'],
+                DCF_CONFIG['forecast_years'], engine=model.engine
+            ).run(seed=0)
+            result['monte_carlo'] = {
+                'paths': MONTE_CARLO_CONFIG['n_paths'],
+                'mean': simulation['mean'],
+                'std': simulation['std'],
+                'percentiles': {str(level): value for level, value in simulation['percentiles'].items()},
+                'rejected': simulation['rejected']
+            }
+        return result
+
+    def run(self, steps: Optional[List[str]] = None,
+            monte_carlo: bool = ENGINE_CONFIG['monte_carlo']) -> Optional[dict]:
+        """Run `steps` (all by default) and write the results; None if no data could be loaded"""
+        steps = steps or STEPS
+        self.timings = {}
+
+        def timed(name, compute):
+            start = time.perf_counter()
+            with self.reporter.step(name.capitalize()), span(f"engine.{name.replace(' ', '_')}"):
+                value = compute()
+            self.timings[name] = round(time.perf_counter() - start, 3)
+            return value
+
+        series_store = timed('refresh', self.refresh) if 'refresh' in steps else self.load_store()
+        if series_store is None:
+            self.reporter.error("No series data available")
+            return None
+
+        results = {
+            'created_at': time.time(),
+            'store_fingerprint': series_store.fingerprint(),
+            'series_count': len(series_store.series_ids),
+            'steps': steps
+        }
+        if 'signals' in steps:
+            results['signals'] = frame_to_json(timed('signals', lambda: signal_frame(series_store)))
+        if 'dcf' in steps:
+            financial_data = timed('dcf inputs', self.dcf_inputs)
+            if financial_data is None:
+                self.reporter.warning("DCF inputs unavailable; skipping the valuation")
+            else:
+                dcf = timed('dcf', lambda: self.compute_dcf(financial_data, monte_carlo))
+                if dcf is not None:
+                    results['dcf'] = dcf
+
+        # Results of steps not run this time are kept while they still apply
+        previous = self.results.read() or {}
+        if 'signals' not in results and previous.get('store_fingerprint') == results['store_fingerprint']:
+            results['signals'] = previous.get('signals')
+        if 'dcf' not in results and 'dcf' in previous:
+            results['dcf'] = previous['dcf']
+        results = {key: value for key, value in results.items() if value is not None}
+
+        results['timings'] = self.timings
+        results['requests'] = self.request_report
+        self.results.write(results)
+        self.reporter.success(f"Wrote results to {self.results.path}")
+        return results
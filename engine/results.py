@@ -0,0 +1,104 @@
+import io
+import json
+import os
+import tempfile
+import threading
+from typing import Optional
+import pandas as pd
+from config.settings import ENGINE_CONFIG, FRED_CONFIG
+from data.series_store import SeriesStore
+from data.snapshot import snapshot_identity
+from models.signals import store_signals
+
+
+def frame_to_json(df: pd.DataFrame) -> dict:
+    return json.loads(df.to_json(orient='split', date_format='iso'))
+
+
+def frame_from_json(data: dict) -> pd.DataFrame:
+    return pd.read_json(io.StringIO(json.dumps(data)), orient='split', convert_dates=False)
+
+
+def signal_frame(series_store: SeriesStore) -> pd.DataFrame:
+    """Current change value and status of every series, with its name and category"""
+    frame = store_signals(series_store, FRED_CONFIG).frame()
+    names = {}
+    categories = {}
+    for category, series_dict in FRED_CONFIG['series'].items():
+        for series_id, info in series_dict.items():
+            names[series_id] = info['name']
+            categories[series_id] = category
+    frame.insert(0, 'name', frame.index.map(names))
+    frame.insert(1, 'category', frame.index.map(categories))
+    return frame
+
+
+class ResultStore:
+    """Results of a batch engine run, kept in one JSON file.
+
+    The file is replaced atomically, so pages read either the previous or
+    the new run. Results record the fingerprint of the store they were
+    computed from; pages only use them while that store is the one shown.
+    """
+
+    def __init__(self, path: str = ENGINE_CONFIG['results_path']):
+        self.path = path
+        self._identity = None
+        self._results: Optional[dict] = None
+        self._lock = threading.Lock()
+
+    def write(self, results: dict):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.results-')
+        try:
+            with os.fdopen(fd, 'w') as handle:
+                json.dump(results, handle)
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def read(self) -> Optional[dict]:
+        """Latest results, re-read only when the file has been replaced"""
+        identity = snapshot_identity(self.path)
+        with self._lock:
+            if identity != self._identity:
+                try:
+                    with open(self.path) as handle:
+                        self._results = json.load(handle)
+                except (OSError, ValueError):
+                    self._results = None
+                self._identity = identity
+            return self._results
+
+    def for_store(self, series_store: SeriesStore) -> Optional[dict]:
+        """Latest results if they were computed from `series_store`'s data"""
+        results = self.read()
+        if results is None or results.get('store_fingerprint') != series_store.fingerprint():
+            return None
+        return results
+
+    def signals(self, series_store: SeriesStore) -> pd.DataFrame:
+        """Precomputed signals of the store, or computed here when none match it"""
+        results = self.for_store(series_store)
+        if results is None or 'signals' not in results:
+            return series_store.memo('signal_frame', lambda: signal_frame(series_store))
+
+        def load():
+            frame = frame_from_json(results['signals'])
+            frame.index.name = 'series_id'
+            frame['last_date'] = pd.to_datetime(frame['last_date'])
+            return frame
+
+        return series_store.memo(('precomputed_signals', results['created_at']), load)
+
+
+_result_store = ResultStore()
+
+
+def get_result_store() -> ResultStore:
+    """The engine results read by every session in this process"""
+    return _result_store
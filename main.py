@@ -1,6 +1,12 @@
 import streamlit as st
-from config.settings import APP_CONFIG
-from pages import dashboard, data_viewer
+from config.settings import APP_CONFIG, PROFILE_CONFIG, REFRESH_CONFIG
+from pages import backtest, dashboard, data_viewer
+from data.metrics import get_metric_graph
+from data.scheduler import start_refresh_scheduler
+from data.shared_store import get_shared_store
+from utils.refresh_status import show_refresh_status
+from utils.timing import reset_section_timings, show_profile_panel, show_section_timings, timed_section
+from utils.tracing import start_trace
 
 # Page configuration
 st.set_page_config(
@@ -9,22 +15,53 @@ st.set_page_config(
     layout="wide"
 )
 
+# Check the derived-metric formulas up front; an invalid one stops the app here, not on first use
+get_metric_graph()
+
+# Section timings are collected per run
+reset_section_timings()
+
 # Initialize session state
-if 'category_data' not in st.session_state:
-    st.session_state.category_data = None
+if 'series_store' not in st.session_state:
+    st.session_state.series_store = None
+
+# Point the session at the process-wide data; sessions share one copy.
+# sync() maps a snapshot written by another server process, if newer.
+shared_store = get_shared_store()
+shared_store.sync()
+# Read the version first so a concurrent publish triggers a rerun rather than being missed
+st.session_state['store_version'] = shared_store.version
+shared_data = shared_store.get()
+if shared_data is not None:
+    st.session_state.series_store = shared_data
+
+# The background scheduler keeps the shared data current; pages never wait on FRED
+scheduler = start_refresh_scheduler(shared_store, data_viewer.get_observation_cache())
 
 # Sidebar navigation
 st.sidebar.title('Navigation')
 page = st.sidebar.radio(
     'Select Page:',
-    ['Data Viewer', 'Dashboard']
+    ['Data Viewer', 'Dashboard', 'Backtest']
 )
+st.sidebar.checkbox('Full resolution charts', key='full_resolution')
+profile = st.sidebar.toggle('Profile reruns', value=PROFILE_CONFIG['enabled'], key='profile_reruns')
+if REFRESH_CONFIG['enabled']:
+    with st.sidebar:
+        show_refresh_status(scheduler, shared_store)
+
+# Display selected page; with profiling on, spans opened below are recorded in a trace
+with start_trace(f"Rerun: {page}", enabled=profile) as trace, timed_section(f"Page: {page}"):
+    if page == 'Data Viewer':
+        data_viewer.show_page()
+    elif page == 'Dashboard':
+        if st.session_state.series_store is None:
+            st.warning("Please load data first in the Data Viewer page")
+        else:
+            dashboard.show_page()
+    elif page == 'Backtest':
+        backtest.show_page()
 
-# Display selected page
-if page == 'Data Viewer':
-    data_viewer.show_page()
-elif page == 'Dashboard':
-    if st.session_state.category_data is None:
-        st.warning("Please load data first in the Data Viewer page")
-    else:
-        dashboard.show_page()
\ No newline at end of file
+show_section_timings()
+if trace is not None:
+    show_profile_panel(trace)
@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+from config.settings import BACKTEST_CONFIG
+from data.series_store import AlignedStore
+from models.signals import STATUS_LEVELS, SignalTable, series_flags
+
+# Unique labels: "Keep an eye" appears twice with different colors
+STATE_LABELS = [f"{label} ({color})" for label, color in STATUS_LEVELS]
+N_STATES = len(STATUS_LEVELS)
+
+
+def _range_min(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Minimum of values[start:end] for every (start, end) pair; NaN where empty.
+
+    Uses a sparse table, so any number of windows of any length cost
+    O(n log n) to prepare and O(1) each to answer.
+    """
+    n = len(values)
+    result = np.full(len(starts), np.nan)
+    if n == 0:
+        return result
+
+    table = [values]
+    width = 1
+    while width * 2 <= n:
+        previous = table[-1]
+        table.append(np.minimum(previous[:-width], previous[width:]))
+        width *= 2
+
+    lengths = ends - starts
+    query = lengths > 0
+    levels = np.zeros(len(starts), dtype=np.int64)
+    levels[query] = np.floor(np.log2(lengths[query])).astype(np.int64)
+
+    for level in np.unique(levels[query]):
+        selected = query & (levels == level)
+        span = 1 << level
+        left = table[level][starts[selected]]
+        right = table[level][ends[selected] - span]
+        result[selected] = np.minimum(left, right)
+    return result
+
+
+class BacktestResult:
+    """Status transition counts and drawdown hit rates from a backtest"""
+
+    def __init__(self, series_ids: List[str], transitions: np.ndarray, hit_rates: pd.DataFrame):
+        self.series_ids = series_ids
+        self.transitions = transitions
+        self.hit_rates = hit_rates
+        self.index = {series_id: row for row, series_id in enumerate(series_ids)}
+
+    def transition_matrix(self, series_id: Optional[str] = None, normalize: bool = True) -> pd.DataFrame:
+        """State-to-next-state matrix for one series, or pooled over all series"""
+        counts = self.transitions.sum(axis=0) if series_id is None else self.transitions[self.index[series_id]]
+        matrix = counts.astype(float)
+        if normalize:
+            totals = matrix.sum(axis=1, keepdims=True)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                matrix = np.where(totals > 0, matrix / totals, np.nan)
+        return pd.DataFrame(matrix, index=STATE_LABELS, columns=STATE_LABELS)
+
+
+def drawdown_outcomes(store: AlignedStore, target: str, horizon_days: int,
+                      relative_threshold: float, points_threshold: float,
+                      is_level: bool) -> np.ndarray:
+    """Whether `target` drew down within the horizon after each store date.
+
+    Returns one value per store date: 1 if the target's minimum over
+    (date, date + horizon] fell below its as-of value by the threshold
+    (relative for levels, in points for percent series), 0 if not, and
+    -1 where the window is not fully observed yet or nothing is known.
+    """
+    target_series = store.series(target)
+    target_dates = target_series.index.values
+    target_values = target_series.to_numpy(dtype=float)
+    dates = store.dates
+
+    as_of = np.searchsorted(target_dates, dates, side='right') - 1
+    horizon_end = dates + np.timedelta64(horizon_days, 'D')
+    starts = as_of + 1
+    ends = np.searchsorted(target_dates, horizon_end, side='right')
+
+    future_min = _range_min(target_values, np.maximum(starts, 0), ends)
+    current = np.where(as_of >= 0, target_values[np.maximum(as_of, 0)], np.nan)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if is_level:
+            drawdown = future_min / current - 1 <= -relative_threshold
+        else:
+            drawdown = future_min - current <= -points_threshold
+
+    known = (as_of >= 0) & (ends > starts) & (len(target_dates) > 0)
+    if len(target_dates):
+        known &= horizon_end <= target_dates[-1]
+    return np.where(known, drawdown.astype(np.int8), -1)
+
+
+def run_backtest(store: AlignedStore, signals: SignalTable, config: Dict,
+                 targets: Optional[List[str]] = None,
+                 horizon_days: int = BACKTEST_CONFIG['horizon_days'],
+                 relative_threshold: float = BACKTEST_CONFIG['drawdown_threshold'],
+                 points_threshold: float = BACKTEST_CONFIG['drawdown_points']) -> BacktestResult:
+    """Score every historical status of every series against later drawdowns.
+
+    All (series, date) observations are processed as flat arrays: status
+    transitions are counted between consecutive observations of a series,
+    and each status is matched with the drawdown outcome of every target
+    that follows its date.
+    """
+    targets = [t for t in (targets or BACKTEST_CONFIG['targets']) if t in store]
+    n_series = len(signals.series_ids)
+
+    # Observations in (series, date) order
+    rows, columns = np.nonzero(signals.valid)
+    states = signals.history_status[rows, columns].astype(np.int64)
+
+    # Transitions between consecutive observations of the same series
+    same_series = rows[1:] == rows[:-1]
+    pair_index = (rows[1:] * N_STATES + states[:-1]) * N_STATES + states[1:]
+    transitions = np.bincount(
+        pair_index[same_series], minlength=n_series * N_STATES * N_STATES
+    ).reshape(n_series, N_STATES, N_STATES)
+
+    flags = series_flags(targets, config)
+    level_targets = ~(flags['pc1'] | flags['percent'])
+
+    records = []
+    cell = rows * N_STATES + states
+    for target, is_level in zip(targets, level_targets):
+        outcomes = drawdown_outcomes(
+            store, target, horizon_days, relative_threshold, points_threshold, bool(is_level)
+        )[columns]
+        known = outcomes >= 0
+
+        observations = np.bincount(cell[known], minlength=n_series * N_STATES).reshape(n_series, N_STATES)
+        hits = np.bincount(
+            cell[known], weights=outcomes[known], minlength=n_series * N_STATES
+        ).reshape(n_series, N_STATES)
+
+        base_observations = np.bincount(rows[known], minlength=n_series)
+        base_hits = np.bincount(rows[known], weights=outcomes[known], minlength=n_series)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rates = hits / observations
+            base_rates = base_hits / base_observations
+
+        for row, series_id in enumerate(signals.series_ids):
+            for state in range(N_STATES):
+                records.append({
+                    'target': target,
+                    'series_id': series_id,
+                    'state': STATE_LABELS[state],
+                    'observations': int(observations[row, state]),
+                    'drawdowns': int(hits[row, state]),
+                    'hit_rate': rates[row, state],
+                    'base_rate': base_rates[row],
+                    'lift': rates[row, state] / base_rates[row] if base_rates[row] else np.nan
+                })
+
+    hit_rates = pd.DataFrame.from_records(
+        records,
+        columns=['target', 'series_id', 'state', 'observations', 'drawdowns', 'hit_rate', 'base_rate', 'lift']
+    )
+    return BacktestResult(list(signals.series_ids), transitions, hit_rates)
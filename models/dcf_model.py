@@ -1,99 +1,168 @@
 import pandas as pd
 import numpy as np
-import streamlit as st
+from typing import Dict, Optional
+from utils.progress import Reporter
+from utils.tracing import traced
+
+
+class DCFEngine:
+    """Closed-form DCF evaluated with numpy over precomputed historical statistics.
+
+    The growth and tax statistics are derived from the history once; every
+    evaluation after that is a handful of array operations, and parameters
+    may be scalars or broadcastable arrays.
+    """
+
+    @traced('dcf.engine')
+    def __init__(self, financial_data: pd.DataFrame):
+        profits = financial_data['Corporate Profits Before Tax']
+
+        # Historical statistics, computed once
+        self.avg_growth_rate = float(profits.pct_change().dropna().mean())
+        self.last_revenue = float(financial_data.iloc[-1]['Corporate Profits Before Tax'])
+        self.tax_rate = float(1 - (
+                financial_data['Corporate Profits After Tax'] / profits
+        ).mean())
+
+        # Year-one FCF before growth: revenue net of tax (simplified FCF)
+        self.base_fcf = self.last_revenue * (1 - self.tax_rate)
+
+    def evaluate(self, wacc, terminal_growth, forecast_years) -> Dict[str, np.ndarray]:
+        """Enterprise value and its components for broadcast parameter arrays"""
+        wacc = np.asarray(wacc, dtype=float)
+        terminal_growth = np.asarray(terminal_growth, dtype=float)
+        forecast_years = np.asarray(forecast_years, dtype=float)
+
+        growth = 1 + self.avg_growth_rate
+        discount = 1 + wacc
+
+        # Sum of FCF_i / (1 + wacc)^i for i = 1..n as a geometric series
+        ratio = growth / discount
+        with np.errstate(divide='ignore', invalid='ignore'):
+            geometric = np.where(
+                np.isclose(ratio, 1.0),
+                forecast_years,
+                ratio * (1 - ratio ** forecast_years) / (1 - ratio)
+            )
+            pv_sum = self.base_fcf * geometric
+
+            final_fcf = self.base_fcf * growth ** forecast_years
+            terminal_value = final_fcf * (1 + terminal_growth) / (wacc - terminal_growth)
+            terminal_value_pv = terminal_value / discount ** forecast_years
+
+        return {
+            'pv_sum': pv_sum,
+            'terminal_value': terminal_value,
+            'terminal_value_pv': terminal_value_pv,
+            'enterprise_value': pv_sum + terminal_value_pv
+        }
+
+    def sensitivity_grid(self, wacc_values, growth_values, forecast_years) -> np.ndarray:
+        """Enterprise value over a WACC x terminal growth grid.
+
+        A scalar `forecast_years` gives a (wacc, growth) matrix; a sequence
+        adds a third axis. The grid is evaluated in one broadcast pass, and
+        cells where WACC does not exceed terminal growth are NaN.
+        """
+        wacc = np.asarray(wacc_values, dtype=float).reshape(-1, 1)
+        growth = np.asarray(growth_values, dtype=float).reshape(1, -1)
+        years = np.asarray(forecast_years, dtype=float)
+
+        if years.ndim:
+            wacc = wacc[:, :, np.newaxis]
+            growth = growth[:, :, np.newaxis]
+            years = years.reshape(1, 1, -1)
+
+        enterprise_value = self.evaluate(wacc, growth, years)['enterprise_value']
+        return np.where(wacc > growth, enterprise_value, np.nan)
+
+    def present_values(self, wacc: float, forecast_years: int) -> np.ndarray:
+        """Discounted FCF of each forecast year, without the rest of the forecast"""
+        periods = np.arange(1, forecast_years + 1)
+        return self.base_fcf * ((1 + self.avg_growth_rate) / (1 + wacc)) ** periods
+
+    def forecast(self, wacc: float, forecast_years: int) -> Dict[str, np.ndarray]:
+        """Year-by-year revenue, taxes, FCF and present values"""
+        periods = np.arange(1, forecast_years + 1)
+        revenue = self.last_revenue * (1 + self.avg_growth_rate) ** periods
+        taxes = revenue * self.tax_rate
+        fcf = revenue - taxes
+        return {
+            'revenue': revenue,
+            'taxes': taxes,
+            'fcf': fcf,
+            'present_values': fcf / (1 + wacc) ** periods
+        }
 
 
 class DCFModel:
-    def __init__(self, financial_data, wacc, terminal_growth, forecast_years):
+    def __init__(self, financial_data, wacc, terminal_growth, forecast_years,
+                 engine: Optional[DCFEngine] = None, reporter: Optional[Reporter] = None):
         self.financial_data = financial_data
         self.wacc = wacc
         self.terminal_growth = terminal_growth
         self.forecast_years = forecast_years
-
-    def calculate_dcf(self):
+        self._engine = engine
+        self.reporter = reporter or Reporter()
+
+    @property
+    def engine(self) -> DCFEngine:
+        """Engine holding the historical statistics, built on first use"""
+        if self._engine is None:
+            self._engine = DCFEngine(self.financial_data)
+        return self._engine
+
+    @traced('dcf.calculate')
+    def calculate_dcf(self, include_forecast: bool = True):
         """Calculate DCF based on historical financial data"""
         try:
-            # Get historical growth rate
-            historical_data = self.financial_data['Corporate Profits Before Tax']
-            growth_rates = historical_data.pct_change().dropna()
-            avg_growth_rate = growth_rates.mean()
-
-            # Last known values
-            last_values = self.financial_data.iloc[-1]
-            last_revenue = last_values['Corporate Profits Before Tax']
-
-            # Create forecast DataFrame
-            years = pd.date_range(start='2025', periods=self.forecast_years, freq='Y')
-            forecast_df = pd.DataFrame(index=years)
-
-            # Revenue forecast
-            forecast_df['Revenue'] = [
-                last_revenue * (1 + avg_growth_rate) ** (i + 1)
-                for i in range(self.forecast_years)
-            ]
-
-            # Calculate effective tax rate
-            tax_rate = 1 - (
-                    self.financial_data['Corporate Profits After Tax'] /
-                    self.financial_data['Corporate Profits Before Tax']
-            ).mean()
-
-            # Financial calculations
-            forecast_df['Pre-Tax Income'] = forecast_df['Revenue']
-            forecast_df['Taxes'] = forecast_df['Pre-Tax Income'] * tax_rate
-            forecast_df['Net Income'] = forecast_df['Pre-Tax Income'] - forecast_df['Taxes']
-            forecast_df['FCF'] = forecast_df['Net Income']  # Simplified FCF
-
-            # Terminal value
-            final_fcf = forecast_df['FCF'].iloc[-1]
-            terminal_value = final_fcf * (1 + self.terminal_growth) / (
-                    self.wacc - self.terminal_growth
-            )
-
-            # Present values
-            present_values = [
-                fcf / (1 + self.wacc) ** (i + 1)
-                for i, fcf in enumerate(forecast_df['FCF'])
-            ]
-
-            # Terminal value present value
-            terminal_value_pv = terminal_value / (1 + self.wacc) ** self.forecast_years
-
-            # Enterprise value
-            enterprise_value = sum(present_values) + terminal_value_pv
-
-            return {
-                'forecast': forecast_df,
-                'terminal_value': terminal_value,
-                'present_values': present_values,
-                'terminal_value_pv': terminal_value_pv,
-                'enterprise_value': enterprise_value
-            }
+            result = self.engine.evaluate(self.wacc, self.terminal_growth, self.forecast_years)
+
+            output = {}
+
+            # The forecast is only a view for display; valuation loops can skip it
+            if include_forecast:
+                forecast = self.engine.forecast(self.wacc, self.forecast_years)
+                present_values = forecast['present_values']
+                years = pd.date_range(start='2025', periods=self.forecast_years, freq='YE')
+                forecast_df = pd.DataFrame(index=years)
+                forecast_df['Revenue'] = forecast['revenue']
+                forecast_df['Pre-Tax Income'] = forecast['revenue']
+                forecast_df['Taxes'] = forecast['taxes']
+                forecast_df['Net Income'] = forecast['fcf']
+                forecast_df['FCF'] = forecast['fcf']  # Simplified FCF
+                output['forecast'] = forecast_df
+            else:
+                present_values = self.engine.present_values(self.wacc, self.forecast_years)
+
+            output.update({
+                'terminal_value': float(result['terminal_value']),
+                'present_values': present_values.tolist(),
+                'terminal_value_pv': float(result['terminal_value_pv']),
+                'enterprise_value': float(result['enterprise_value'])
+            })
+
+            return output
 
         except Exception as e:
-            st.error(f"Error in DCF calculation: {str(e)}")
+            self.reporter.error(f"Error in DCF calculation: {str(e)}")
             return None
 
-    def sensitivity_analysis(self):
-        """Perform sensitivity analysis on WACC and terminal growth"""
-        wacc_range = np.linspace(self.wacc - 0.02, self.wacc + 0.02, 5)
+    @traced('dcf.sensitivity')
+    def sensitivity_analysis(self, points: int = 5, spread: float = 0.02, forecast_years_range=None):
+        """Perform sensitivity analysis on WACC and terminal growth.
+
+        Returns the enterprise value grid with the WACC and growth axes; pass
+        `forecast_years_range` to add a forecast-years axis to the grid.
+        """
+        wacc_range = np.linspace(self.wacc - spread, self.wacc + spread, points)
         growth_range = np.linspace(
-            self.terminal_growth - 0.02,
-            self.terminal_growth + 0.02,
-            5
+            self.terminal_growth - spread,
+            self.terminal_growth + spread,
+            points
         )
+        forecast_years = self.forecast_years if forecast_years_range is None else forecast_years_range
 
-        sensitivity_matrix = np.zeros((len(wacc_range), len(growth_range)))
-
-        for i, w in enumerate(wacc_range):
-            for j, g in enumerate(growth_range):
-                temp_model = DCFModel(
-                    self.financial_data,
-                    w, g,
-                    self.forecast_years
-                )
-                result = temp_model.calculate_dcf()
-                if result:
-                    sensitivity_matrix[i, j] = result['enterprise_value']
+        sensitivity_matrix = self.engine.sensitivity_grid(wacc_range, growth_range, forecast_years)
 
-        return sensitivity_matrix, wacc_range, growth_range
\ No newline at end of file
+        return sensitivity_matrix, wacc_range, growth_range
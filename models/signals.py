@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+from typing import Dict
+from config.settings import STORE_CONFIG
+from data.series_store import AlignedStore, SeriesStore
+from utils.tracing import traced
+
+# Status codes shared by the dashboard, the signal history and the backtest
+STATUS_LEVELS = [
+    ("Insufficient data", "gray"),
+    ("All clear", "green"),
+    ("Keep an eye", "lightgreen"),
+    ("Potential danger", "orange"),
+    ("Danger", "red"),
+    ("Keep an eye", "yellow"),
+]
+INSUFFICIENT, ALL_CLEAR, KEEP_AN_EYE, POTENTIAL_DANGER, DANGER, KEEP_AN_EYE_MIXED = range(6)
+
+
+class SignalTable:
+    """Change values and status codes for every series, latest and historical.
+
+    `history_status` and `history_change` are (series, dates) arrays on the
+    store's date grid; dates without an observation hold INSUFFICIENT / NaN.
+    """
+
+    def __init__(self, series_ids, dates, valid, current_value, last_date, change, status,
+                 history_change, history_status):
+        self.series_ids = series_ids
+        self.dates = dates
+        self.valid = valid
+        self.current_value = current_value
+        self.last_date = last_date
+        self.change = change
+        self.status = status
+        self.history_change = history_change
+        self.history_status = history_status
+        self.index = {series_id: row for row, series_id in enumerate(series_ids)}
+
+    def frame(self) -> pd.DataFrame:
+        """Compact status table, one row per series"""
+        labels = np.array([label for label, _ in STATUS_LEVELS])
+        colors = np.array([color for _, color in STATUS_LEVELS])
+        return pd.DataFrame({
+            'value': self.current_value,
+            'last_date': self.last_date,
+            'change': self.change,
+            'status_code': self.status,
+            'status': labels[self.status],
+            'color': colors[self.status]
+        }, index=pd.Index(self.series_ids, name='series_id'))
+
+    def status_history(self, series_id: str) -> pd.Series:
+        """Status code of a series at each of its observation dates"""
+        row = self.index[series_id]
+        observed = self.valid[row]
+        return pd.Series(
+            self.history_status[row, observed],
+            index=pd.DatetimeIndex(self.dates[observed], name='date'),
+            name=series_id
+        )
+
+
+def series_flags(series_ids, config: Dict) -> Dict[str, np.ndarray]:
+    """Per-series config as arrays: inverse correlation, pc1 units, percent values"""
+    info = {
+        series_id: series_info
+        for series_dict in config['series'].values()
+        for series_id, series_info in series_dict.items()
+    }
+    return {
+        'inverse': np.array([info.get(s, {}).get('correlation', 'Direct') == 'Inverse' for s in series_ids]),
+        'pc1': np.array([info.get(s, {}).get('units', 'lin') == 'pc1' for s in series_ids]),
+        'percent': np.array([info.get(s, {}).get('is_percent', False) for s in series_ids])
+    }
+
+
+def compact_valid(store: AlignedStore):
+    """Right-align every series' valid values in one (series, max_count) matrix.
+
+    Returns the matrix, the store column each cell came from (-1 for
+    padding) and the per-series valid counts.
+    """
+    counts = store.valid.sum(axis=1)
+    width = int(counts.max()) if counts.size else 0
+
+    rows, columns = np.nonzero(store.valid)
+    rank = np.cumsum(store.valid, axis=1)[rows, columns] - 1
+    target = (width - counts[rows]) + rank
+
+    compact = np.full((len(store.series_ids), width), np.nan)
+    compact[rows, target] = store.values[rows, columns]
+    source = np.full((len(store.series_ids), width), -1, dtype=np.int64)
+    source[rows, target] = columns
+    return compact, source, counts
+
+
+def _shift(array: np.ndarray, periods: int, fill=np.nan) -> np.ndarray:
+    """Shift along the date axis, padding with `fill`"""
+    shifted = np.full_like(array, fill)
+    if periods < array.shape[1]:
+        shifted[:, periods:] = array[:, :array.shape[1] - periods]
+    return shifted
+
+
+@traced('signals.compute')
+def compute_signals(store: AlignedStore, config: Dict) -> SignalTable:
+    """Evaluate the dashboard change and status rules for all series and dates at once.
+
+    Mirrors the original per-series dashboard rules, kept as the oracle in
+    tests/test_signals.py: every position of the compacted matrix is
+    treated as the latest point of the history up to it, so the final
+    column is the current signal.
+    """
+    flags = series_flags(store.series_ids, config)
+    inverse = flags['inverse'][:, np.newaxis]
+    pc1 = flags['pc1'][:, np.newaxis]
+    percent = flags['percent'][:, np.newaxis]
+
+    compact, source, counts = compact_valid(store)
+    width = compact.shape[1]
+    # Number of valid points up to and including each column
+    available = np.arange(1, width + 1)[np.newaxis, :] - (width - counts)[:, np.newaxis]
+
+    previous = _shift(compact, 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct_change = compact / previous - 1
+
+    # Change value: level for pc1, difference for percents, else percent change
+    change = np.where(pc1, compact, np.where(percent, compact - previous, pct_change * 100))
+    change = np.where(inverse, -change, change)
+    change = np.where(available >= 2, change, np.where(available >= 1, 0.0, np.nan))
+
+    # Status: signs of the last three changes (levels for pc1 series)
+    step = np.where(pc1, compact, pct_change)
+    step = np.where(inverse, -step, step)
+    positive = step > 0
+    positive_count = (
+        positive.astype(np.int8)
+        + _shift(positive, 1, fill=False)
+        + _shift(positive, 2, fill=False)
+    )
+
+    status = np.full(compact.shape, KEEP_AN_EYE_MIXED, dtype=np.int8)
+    status[(positive_count == 1) & ~positive] = POTENTIAL_DANGER
+    status[(positive_count == 2) & positive] = KEEP_AN_EYE
+    status[positive_count == 3] = ALL_CLEAR
+    status[positive_count == 0] = DANGER
+    status[available < 4] = INSUFFICIENT
+
+    # Scatter the compacted results back onto the store's date grid
+    history_change = np.full(store.values.shape, np.nan)
+    history_status = np.full(store.values.shape, INSUFFICIENT, dtype=np.int8)
+    rows, columns = np.nonzero(source >= 0)
+    history_change[rows, source[rows, columns]] = change[rows, columns]
+    history_status[rows, source[rows, columns]] = status[rows, columns]
+
+    last_column = source[:, -1] if width else np.full(len(store.series_ids), -1)
+    has_data = counts > 0
+    last_date = np.where(has_data, store.dates[np.maximum(last_column, 0)], np.datetime64('NaT'))
+
+    return SignalTable(
+        series_ids=list(store.series_ids),
+        dates=store.dates,
+        valid=store.valid,
+        current_value=compact[:, -1] if width else np.full(len(store.series_ids), np.nan),
+        last_date=last_date,
+        change=np.where(counts >= 2, change[:, -1], 0.0) if width else np.zeros(len(store.series_ids)),
+        status=status[:, -1] if width else np.zeros(len(store.series_ids), dtype=np.int8),
+        history_change=history_change,
+        history_status=history_status
+    )
+
+
+def store_signals(series_store: SeriesStore, config: Dict,
+                  freq: str = STORE_CONFIG['signal_frequency']) -> SignalTable:
+    """Signals of every series on the `freq` grid, computed once per store"""
+    return series_store.memo(
+        ('signals', freq),
+        lambda: compute_signals(series_store.aligned(freq), config)
+    )
@@ -0,0 +1,110 @@
+import streamlit as st
+import plotly.express as px
+from config.settings import FRED_CONFIG, BACKTEST_CONFIG, STORE_CONFIG
+from models.signals import store_signals
+from models.backtest import STATE_LABELS, run_backtest
+from utils.timing import timed_section
+
+
+def series_names() -> dict:
+    """Friendly name of every configured series"""
+    return {
+        series_id: info['name']
+        for series_dict in FRED_CONFIG['series'].values()
+        for series_id, info in series_dict.items()
+    }
+
+
+def show_hit_rates(result, target: str, names: dict):
+    """Table of drawdown hit rates per series and status for one target"""
+    table = result.hit_rates[result.hit_rates['target'] == target]
+    if table.empty:
+        st.warning(f"No backtest results for {names.get(target, target)}")
+        return
+
+    pivot = table.pivot(index='series_id', columns='state', values='hit_rate')[STATE_LABELS]
+    # Aligned on series ID; pivot sorts its rows, so positional assignment would mismatch them
+    pivot['Base rate'] = table.groupby('series_id')['base_rate'].first()
+    pivot.index = [names.get(series_id, series_id) for series_id in pivot.index]
+
+    st.subheader(f"Drawdown hit rates for {names.get(target, target)}")
+    st.caption(
+        "Share of observations in each status that were followed by a drawdown "
+        "of the target within the horizon"
+    )
+    st.dataframe(pivot.style.format("{:.1%}", na_rep="–"))
+
+
+def show_transitions(result, names: dict):
+    """Heatmap of status transition probabilities"""
+    options = ['All series'] + result.series_ids
+    selected = st.selectbox(
+        "Transition matrix for",
+        options,
+        format_func=lambda option: names.get(option, option)
+    )
+    series_id = None if selected == 'All series' else selected
+    matrix = result.transition_matrix(series_id)
+
+    fig = px.imshow(
+        matrix,
+        text_auto='.0%',
+        color_continuous_scale='Blues',
+        labels=dict(x="Next status", y="Status", color="Probability"),
+        title=f"Status transitions - {names.get(selected, selected)}"
+    )
+    fig.update_layout(height=500, template="plotly_white")
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def show_page():
+    """Main page function"""
+    st.title("Status Signal Backtest")
+
+    series_store = st.session_state.get('series_store')
+    if series_store is None:
+        st.warning("Please load data first in the Data Viewer page")
+        return
+
+    names = series_names()
+    targets = [target for target in BACKTEST_CONFIG['targets'] if target in series_store]
+    if not targets:
+        st.warning("None of the backtest target series are loaded")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        target = st.selectbox("Drawdown target", targets, format_func=lambda t: names.get(t, t))
+    with col2:
+        horizon_days = st.number_input(
+            "Horizon (days)", min_value=30, max_value=1825,
+            value=BACKTEST_CONFIG['horizon_days'], step=30
+        )
+    with col3:
+        relative_threshold = st.number_input(
+            "Drawdown threshold (levels, %)", min_value=0.1, max_value=50.0,
+            value=BACKTEST_CONFIG['drawdown_threshold'] * 100, step=0.5
+        ) / 100
+        points_threshold = st.number_input(
+            "Drawdown threshold (percent series, points)", min_value=0.1, max_value=50.0,
+            value=BACKTEST_CONFIG['drawdown_points'], step=0.5
+        )
+
+    with timed_section("Backtest: run"):
+        # Statuses and drawdowns are evaluated on the signal grid
+        signals = store_signals(series_store, FRED_CONFIG)
+        grid = series_store.aligned(STORE_CONFIG['signal_frequency'])
+        # Keyed by the inputs above, so only recently used settings are kept
+        result = series_store.memo_recent(
+            'backtest',
+            (tuple(targets), horizon_days, relative_threshold, points_threshold),
+            lambda: run_backtest(
+                grid, signals, FRED_CONFIG, targets,
+                horizon_days, relative_threshold, points_threshold
+            ),
+            BACKTEST_CONFIG['cache_entries']
+        )
+
+    with timed_section("Backtest: render"):
+        show_hit_rates(result, target, names)
+        show_transitions(result, names)
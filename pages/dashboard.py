@@ -1,66 +1,17 @@
 import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
-from config.settings import FRED_CONFIG
-
-
-def calculate_change_value(series, series_info):
-    """Calculate change value based on series type and settings"""
-    if len(series) < 2:
-        return 0
-
-    correlation = series_info.get('correlation', 'Direct')
-    units = series_info.get('units', 'lin')
-    is_percent = series_info.get('is_percent', False)
-
-    # For series already in YoY percent change (units='pc1')
-    if units == 'pc1':
-        change = series.iloc[-1]
-    else:
-        if is_percent:
-            # For percentage metrics, use absolute change
-            change = series.iloc[-1] - series.iloc[-2]
-        else:
-            # For non-percentage metrics, calculate percent change
-            change = (series.iloc[-1] / series.iloc[-2] - 1) * 100
-
-    # Inverse the change for inverse correlation
-    return -change if correlation == 'Inverse' else change
-
-
-def calculate_status(series, series_info):
-    """Calculate status based on series configuration"""
-    if len(series) < 4:  # Need at least 4 values to get 3 changes
-        return "Insufficient data", "gray"
-
-    correlation = series_info.get('correlation', 'Direct')
-    units = series_info.get('units', 'lin')
-
-    # For YoY percent change series, use the values directly
-    if units == 'pc1':
-        changes = series.tail(3)
-    else:
-        # Get last 4 values and calculate 3 changes
-        last_four = series.tail(4)
-        changes = last_four.pct_change().tail(3)
-
-    # Adjust for inverse correlation
-    if correlation == 'Inverse':
-        changes = -changes
-
-    positive_changes = (changes > 0).sum()
-    latest_change = changes.iloc[-1] > 0
-
-    if positive_changes == 3:
-        return "All clear", "green"
-    elif positive_changes == 2 and latest_change:
-        return "Keep an eye", "lightgreen"
-    elif positive_changes == 1 and not latest_change:
-        return "Potential danger", "orange"
-    elif positive_changes == 0:
-        return "Danger", "red"
-    else:
-        return "Keep an eye", "yellow"
+import numpy as np
+from config.settings import FRED_CONFIG, DCF_CONFIG, DISPLAY_CONFIG, MONTE_CARLO_CONFIG
+from data.downsample import chart_series
+from engine.batch import BatchEngine
+from engine.results import frame_from_json, get_result_store
+from models.monte_carlo import MonteCarloDCF
+from pages.data_viewer import get_observation_cache
+from utils.figure_cache import data_fingerprint, get_figure_cache
+from utils.exports import csv_download
+from utils.pagination import paginate
+from utils.timing import timed_section
 
 
 def create_metric_card(title, value, change, status, color, is_percent=False):
@@ -85,80 +36,200 @@ def create_metric_card(title, value, change, status, color, is_percent=False):
     return card_html
 
 
-def show_dashboard(data_dict):
+def create_trend_chart(chart_data, metric_name, color):
+    """Create the trend chart shown under a metric card"""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=chart_data.index,
+        y=chart_data.values,
+        mode='lines',
+        name=metric_name,
+        line=dict(color=color)
+    ))
+
+    fig.update_layout(
+        title=f"Trend for {metric_name}",
+        xaxis_title="Date",
+        yaxis_title="Value",
+        height=300,
+        template="plotly_white",
+        hovermode='x unified',
+        showlegend=False
+    )
+    return fig
+
+
+def show_category_cards(series_store, category_name, signals, figure_cache):
+    """Display one page of metric cards and trend charts for a category"""
+    page_ids = paginate(
+        series_store.category_ids(category_name),
+        DISPLAY_CONFIG['cards_per_page'],
+        key=f"{category_name}_cards"
+    )
+
+    # Iterate through metrics on the selected page
+    cols = st.columns(3)  # Layout: 3 columns for metric cards and charts
+    col_idx = 0
+
+    for metric in page_ids:
+        if series_store.valid_count(metric) == 0:
+            st.warning(f"No data available for {metric}")
+            continue
+
+        # Retrieve metric info
+        series_info = FRED_CONFIG['series'][category_name].get(metric, {})
+        metric_name = series_info.get('name', metric)
+        is_percent = series_info.get('is_percent', False)
+
+        # Look up precomputed metrics
+        row = signals.loc[metric]
+        current_value = row['value']
+        change = row['change']
+        status, color = row['status'], row['color']
+
+        # Create and display card
+        card = create_metric_card(
+            metric_name,
+            current_value,
+            change,
+            status,
+            color,
+            is_percent or series_info.get('units') == 'pc1'
+        )
+        cols[col_idx].markdown(card, unsafe_allow_html=True)
+
+        # Add trend chart, downsampled to the card width; reruns reuse the cached figure
+        chart_data = chart_series(
+            series_store, metric,
+            DISPLAY_CONFIG['chart_width_px']['card'],
+            DISPLAY_CONFIG['downsample_method'],
+            full_resolution=st.session_state.get('full_resolution', False)
+        )
+        fig = figure_cache.get_or_build(
+            (metric, data_fingerprint(chart_data), 'card', metric_name, color),
+            lambda: create_trend_chart(chart_data, metric_name, color)
+        )
+
+        cols[col_idx].plotly_chart(fig, use_container_width=True)
+
+        # Add download button with unique key; the CSV is generated on request
+        csv_download(
+            cols[col_idx], series_store, metric, metric_name,
+            key=f"{category_name}_{metric}_download"  # Unique key for each button
+        )
+
+        col_idx = (col_idx + 1) % 3
+
+
+def show_valuation(results):
+    """DCF outputs of the last engine run, if it valued anything"""
+    if not results or 'dcf' not in results:
+        return
+
+    dcf = results['dcf']
+    parameters = dcf['parameters']
+    with st.expander("DCF valuation (precomputed)"):
+        st.caption(
+            f"Corporate profits, WACC {parameters['wacc']:.1%}, terminal growth "
+            f"{parameters['terminal_growth']:.1%}, {parameters['forecast_years']} years · "
+            f"computed {pd.Timestamp(results['created_at'], unit='s'):%Y-%m-%d %H:%M} UTC"
+        )
+        col1, col2 = st.columns(2)
+        col1.metric("Enterprise value", DISPLAY_CONFIG['number_format'].format(dcf['enterprise_value']))
+        col2.metric("Terminal value (PV)", DISPLAY_CONFIG['number_format'].format(dcf['terminal_value_pv']))
+        st.write("Enterprise value by WACC (rows) and terminal growth (columns)")
+        st.dataframe(frame_from_json(dcf['sensitivity']))
+        if 'monte_carlo' in dcf:
+            st.write("Monte Carlo percentiles")
+            st.dataframe(pd.Series(dcf['monte_carlo']['percentiles'], name='enterprise_value'))
+
+
+def run_monte_carlo(n_paths: int):
+    """Simulate the DCF over the corporate profit history; a summary small enough for session state"""
+    # Offline: the page reads the profit history python cli.py cached and never calls FRED
+    financial_data = BatchEngine(cache=get_observation_cache(), offline=True).dcf_inputs()
+    if financial_data is None:
+        return None
+
+    simulation = MonteCarloDCF(
+        financial_data, DCF_CONFIG['wacc'], DCF_CONFIG['terminal_growth'], DCF_CONFIG['forecast_years']
+    ).run(n_paths=n_paths, seed=0)
+    counts, edges = np.histogram(simulation['enterprise_values'], bins=100)
+    return {
+        'paths': n_paths,
+        'mean': simulation['mean'],
+        'std': simulation['std'],
+        'percentiles': simulation['percentiles'],
+        'rejected': simulation['rejected'],
+        'histogram': pd.Series(counts, index=(edges[:-1] + edges[1:]) / 2),
+        'convergence': simulation['convergence']
+    }
+
+
+def show_monte_carlo():
+    """On-demand Monte Carlo distribution of the DCF enterprise value"""
+    with st.expander("Monte Carlo valuation"):
+        n_paths = st.select_slider(
+            "Simulated paths",
+            options=[100_000, 250_000, 500_000, 1_000_000, 2_000_000],
+            value=MONTE_CARLO_CONFIG['n_paths'],
+            key='monte_carlo_paths'
+        )
+        if st.button("Run simulation", key='monte_carlo_run'):
+            with st.spinner("Simulating..."):
+                result = run_monte_carlo(n_paths)
+            if result is None:
+                st.warning("Corporate profit data is not cached yet; run `python cli.py` first.")
+            else:
+                st.session_state['monte_carlo'] = result
+
+        result = st.session_state.get('monte_carlo')
+        if result is None:
+            return
+        st.caption(
+            f"{result['paths']:,} paths around WACC {DCF_CONFIG['wacc']:.1%} and terminal growth "
+            f"{DCF_CONFIG['terminal_growth']:.1%}; {result['rejected']:,} rejected (WACC <= growth)"
+        )
+        col1, col2 = st.columns(2)
+        col1.metric("Mean enterprise value", DISPLAY_CONFIG['number_format'].format(result['mean']))
+        col2.metric("Standard deviation", DISPLAY_CONFIG['number_format'].format(result['std']))
+
+        fig = go.Figure(go.Bar(x=result['histogram'].index, y=result['histogram'].values))
+        for level, value in result['percentiles'].items():
+            fig.add_vline(x=value, line_dash='dot', annotation_text=f"P{level}")
+        fig.update_layout(
+            height=350, template=DISPLAY_CONFIG['chart_defaults']['template'],
+            xaxis_title="Enterprise value", yaxis_title="Paths", bargap=0
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(result['convergence'].set_index('paths'))
+
+
+def show_dashboard(series_store):
     """Display the main dashboard with grouped metrics for each category"""
     st.title("Hospitality Industry Dashboard")
 
-    for category_name, category_df in data_dict.items():
-        if category_df is not None and not category_df.empty:
-            st.header(category_name)
-
-            # Iterate through metrics in the category
-            cols = st.columns(3)  # Layout: 3 columns for metric cards and charts
-            col_idx = 0
-
-            for metric in category_df.columns:
-                series = category_df[metric].dropna()
-                if series.empty:
-                    st.warning(f"No data available for {metric}")
-                    continue
-
-                # Retrieve metric info
-                series_info = FRED_CONFIG['series'][category_name].get(metric, {})
-                metric_name = series_info.get('name', metric)
-                is_percent = series_info.get('is_percent', False)
-
-                # Calculate metrics
-                current_value = series.iloc[-1]
-                change = calculate_change_value(series, series_info)
-                status, color = calculate_status(series, series_info)
-
-                # Create and display card
-                card = create_metric_card(
-                    metric_name,
-                    current_value,
-                    change,
-                    status,
-                    color,
-                    is_percent or series_info.get('units') == 'pc1'
-                )
-                cols[col_idx].markdown(card, unsafe_allow_html=True)
-
-                # Add trend chart
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=series.index,
-                    y=series.values,
-                    mode='lines',
-                    name=metric_name,
-                    line=dict(color=color)
-                ))
-
-                fig.update_layout(
-                    title=f"Trend for {metric_name}",
-                    xaxis_title="Date",
-                    yaxis_title="Value",
-                    height=300,
-                    template="plotly_white",
-                    hovermode='x unified',
-                    showlegend=False
-                )
-
-                cols[col_idx].plotly_chart(fig, use_container_width=True)
-
-                # Add download button with unique key
-                csv = series.to_csv()
-                cols[col_idx].download_button(
-                    label=f"Download {metric_name} Data (CSV)",
-                    data=csv,
-                    file_name=f"{metric_name.replace(' ', '_').lower()}_data.csv",
-                    mime="text/csv",
-                    key=f"{category_name}_{metric}_download"  # Unique key for each button
-                )
-
-                col_idx = (col_idx + 1) % 3
-
-            st.markdown("---")
+    # Change values and statuses from the last engine run (python cli.py) for this data,
+    # else computed in one pass on the month-end grid and shared per store
+    result_store = get_result_store()
+    with timed_section("Dashboard: signals"):
+        signals = result_store.signals(series_store)
+    figure_cache = get_figure_cache()
+
+    # Only the selected category is computed and rendered
+    categories = list(series_store.categories)
+    if not categories:
+        st.warning("No data available")
+        return
+    category_name = st.radio("Category", categories, horizontal=True, key="dashboard_category")
+
+    st.header(category_name)
+    with timed_section(f"Dashboard: {category_name}"):
+        show_category_cards(series_store, category_name, signals, figure_cache)
+    st.markdown("---")
+
+    show_valuation(result_store.read())
+    show_monte_carlo()
 
     # Status legend
     st.sidebar.header("Status Legend")
@@ -176,12 +247,17 @@ def show_dashboard(data_dict):
             unsafe_allow_html=True
         )
 
+    figure_stats = figure_cache.stats()
+    st.sidebar.caption(
+        f"Chart cache: {figure_stats['hits']} hits, {figure_stats['misses']} misses "
+        f"({figure_stats['hit_rate']:.0%}), {figure_stats['bytes'] / 1e6:.1f} MB"
+    )
 
 
 def show_page():
     """Main page function"""
-    if not hasattr(st.session_state, 'category_data'):
+    if st.session_state.get('series_store') is None:
         st.warning("Please load data first in the Data Viewer page")
         return
 
-    show_dashboard(st.session_state.category_data)
\ No newline at end of file
+    show_dashboard(st.session_state.series_store)
\ No newline at end of file
@@ -4,7 +4,17 @@ import plotly.express as px
 import pandas as pd
 import numpy as np
 from data.fred_api import FREDReader
-from config.settings import FRED_CONFIG
+from data.cache import ObservationCache
+from data.scheduler import RefreshScheduler, start_refresh_scheduler
+from data.shared_store import get_shared_store
+from data.series_store import SeriesStore
+from data.downsample import chart_series, downsample_series
+from utils.figure_cache import data_fingerprint, get_figure_cache
+from utils.exports import bulk_download, csv_download
+from utils.pagination import paginate
+from utils.progress import StreamlitReporter
+from utils.timing import timed_section
+from config.settings import FRED_CONFIG, CACHE_CONFIG, STORE_CONFIG, DISPLAY_CONFIG, REFRESH_CONFIG
 
 # Define color palette
 COLORS = {
@@ -88,7 +98,11 @@ def create_grouped_charts(df: pd.DataFrame, metrics_groups: dict, category: str,
                 # Get metric info and friendly name
                 series_info = FRED_CONFIG['series'][category].get(metric, {})
                 friendly_name = series_info.get('name', metric)
-                data = df[metric].dropna()
+                data = downsample_series(
+                    df[metric].dropna(),
+                    DISPLAY_CONFIG['chart_width_px']['full'],
+                    DISPLAY_CONFIG['downsample_method']
+                )
 
                 # Get metric color
                 color = COLORS[category].get(metric, '#000000')
@@ -116,46 +130,69 @@ def create_grouped_charts(df: pd.DataFrame, metrics_groups: dict, category: str,
     return figures
 
 
-def show_category_data(df: pd.DataFrame, category_name: str):
+def create_series_chart(chart_data: pd.Series, metric_name: str, color: str) -> go.Figure:
+    """Create the trend chart of a single series"""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=chart_data.index,
+        y=chart_data.values,
+        mode='lines',
+        name=metric_name,
+        line=dict(color=color)
+    ))
+    fig.update_layout(
+        title=f"Trend for {metric_name}",
+        xaxis_title="Date",
+        yaxis_title="Value",
+        height=400,
+        template="plotly_white",
+        hovermode='x unified',
+        showlegend=True
+    )
+    return fig
+
+
+def show_category_data(series_store: SeriesStore, category_name: str, date_range=(None, None)):
     """Display data for a specific category, treating each series independently"""
-    if df.empty:
+    category_ids = series_store.category_ids(category_name)
+    if not category_ids:
         st.warning(f"No data available for {category_name}")
         return
 
     st.subheader(f"{category_name} Metrics")
+    figure_cache = get_figure_cache()
 
     # Create a mapping of metric codes to friendly names
     metric_names = {
         metric: FRED_CONFIG['series'][category_name][metric]['name']
-        for metric in df.columns
+        for metric in category_ids
     }
 
-    # Iterate over each series individually
-    for series_id in df.columns:
+    # Iterate over the series on the selected page individually
+    page_ids = paginate(category_ids, DISPLAY_CONFIG['series_per_page'], key=f"{category_name}_series")
+    for series_id in page_ids:
         st.subheader(metric_names[series_id])
+        st.caption(f"{series_store.frequency(series_id)} observations")
 
-        series = df[series_id].dropna()
+        series = series_store.series(series_id)
         if series.empty:
             st.warning(f"No data available for {metric_names[series_id]}")
             continue
 
-        # Display trend chart for the series
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=series.index,
-            y=series.values,
-            mode='lines',
-            name=metric_names[series_id],
-            line=dict(color=COLORS[category_name].get(series_id, '#000000'))
-        ))
-        fig.update_layout(
-            title=f"Trend for {metric_names[series_id]}",
-            xaxis_title="Date",
-            yaxis_title="Value",
-            height=400,
-            template="plotly_white",
-            hovermode='x unified',
-            showlegend=True
+        # Display trend chart for the series, downsampled to the chart width;
+        # reruns with unchanged data reuse the cached figure
+        color = COLORS[category_name].get(series_id, '#000000')
+        chart_data = chart_series(
+            series_store, series_id,
+            DISPLAY_CONFIG['chart_width_px']['full'],
+            DISPLAY_CONFIG['downsample_method'],
+            start=date_range[0],
+            end=date_range[1],
+            full_resolution=st.session_state.get('full_resolution', False)
+        )
+        fig = figure_cache.get_or_build(
+            (series_id, data_fingerprint(chart_data), 'full', metric_names[series_id], color),
+            lambda: create_series_chart(chart_data, metric_names[series_id], color)
         )
 
         st.plotly_chart(fig, use_container_width=True)
@@ -164,54 +201,172 @@ def show_category_data(df: pd.DataFrame, category_name: str):
         st.write(f"Summary Statistics for {metric_names[series_id]}")
         st.dataframe(series.describe().to_frame().T)
 
-        # Export option with unique key
-        csv = series.to_csv()
-        st.download_button(
-            label=f"Download {metric_names[series_id]} Data (CSV)",
-            data=csv,
-            file_name=f"{metric_names[series_id].replace(' ', '_').lower()}_data.csv",
-            mime="text/csv",
+        # Export option with unique key; the CSV is generated on request
+        csv_download(
+            st, series_store, series_id, metric_names[series_id],
             key=f"{category_name}_{series_id}_download"  # Unique key
         )
 
-    # Provide an option to view the full data table
-    with st.expander("View Full Data Table"):
-        st.dataframe(df)
+    # Provide an option to view the full data table, built only when requested
+    if st.toggle("View Full Data Table", key=f"{category_name}_full_table"):
+        frequencies = STORE_CONFIG['table_frequencies']
+        frequency = st.selectbox(
+            "Table frequency", list(frequencies), index=list(frequencies).index('Monthly'),
+            key=f"{category_name}_table_frequency"
+        )
+        st.dataframe(series_store.category_frame(category_name, frequencies[frequency]))
+
+
+
+@st.cache_resource
+def get_observation_cache() -> ObservationCache:
+    """Observation cache shared by every session of this process"""
+    return ObservationCache(
+        CACHE_CONFIG['path'],
+        default_ttl_hours=CACHE_CONFIG['default_ttl_hours']
+    )
+
+
+def select_date_range(series_store: SeriesStore):
+    """Chart zoom range; (None, None) when the full history is selected"""
+    first, last = series_store.date_range()
+    if first is None or first == last:
+        return None, None
+
+    first = pd.Timestamp(first).to_pydatetime()
+    last = pd.Timestamp(last).to_pydatetime()
+    start, end = st.slider(
+        "Chart date range",
+        min_value=first,
+        max_value=last,
+        value=(first, last),
+        format="YYYY-MM"
+    )
+    # The full range shares cached chart data with every other session
+    if start == first and end == last:
+        return None, None
+    return pd.Timestamp(start), pd.Timestamp(end)
+
+
+def load_series_store(fred_reader: FREDReader) -> SeriesStore:
+    """Fetch every configured series into a store at their native frequencies"""
+    return SeriesStore.from_series(
+        fred_reader.load_all_series(FRED_CONFIG),
+        FRED_CONFIG,
+        dtype=STORE_CONFIG['dtype']
+    )
+
+
+def show_fetch_report(report: dict, timings: pd.DataFrame):
+    """Request counters and per-series timings of a refresh"""
+    if report:
+        st.caption(
+            f"{report['requests']} FRED requests, {report['retries']} retries "
+            f"({report['throttled']} throttled), "
+            f"{report['rate_wait_seconds'] + report['backoff_seconds']:.1f} s waiting, "
+            f"{report['throughput_per_second']:.1f} requests/s"
+        )
+    st.dataframe(timings)
+
+
+def show_refresh_controls(scheduler: RefreshScheduler, offline: bool):
+    """Queue a background refresh and show the per-series refresh schedule"""
+    if st.button("Refresh now", disabled=offline,
+                 help="Data refreshes in the background; this page keeps showing the current data"):
+        scheduler.request_refresh()
+        st.toast("Refresh queued; the page updates when new data is published")
+
+    with st.expander("Refresh schedule"):
+        status = scheduler.status()
+        if status['last_duration'] is not None:
+            st.caption(f"Last refresh check took {status['last_duration']:.1f} s")
+        st.dataframe(
+            scheduler.series_status().style.format({
+                'interval_hours': '{:.0f}',
+                'refreshed_hours_ago': '{:.1f}',
+                'next_refresh_in_hours': '{:.1f}'
+            })
+        )
 
+    with st.expander("Fetch Timings"):
+        show_fetch_report(scheduler.last_report, scheduler.last_timings)
 
 
 def show_page():
     """Main page function"""
     st.title("Financial Data Viewer")
 
-    # Initialize FRED reader
-    fred_reader = FREDReader(FRED_CONFIG['api_key'])
-
-    if st.button("Load/Refresh Data"):
+    cache = get_observation_cache()
+    shared_store = get_shared_store()
+    if REFRESH_CONFIG['enabled']:
+        # Offline mode belongs to the process-wide scheduler, so it is shared by every session
+        scheduler = start_refresh_scheduler(shared_store, cache)
+        st.checkbox(
+            "Offline mode (serve from local cache only)", value=scheduler.offline, key='offline_mode',
+            on_change=lambda: scheduler.set_offline(st.session_state['offline_mode']),
+            help="Pauses background refreshes from FRED for every session of this server"
+        )
+        offline = scheduler.offline
+    else:
+        scheduler = None
+        offline = st.checkbox("Offline mode (serve from local cache only)")
+
+    # Warm start: fill the shared store from the local cache without the network
+    if shared_store.series_store is None and cache.has_entries():
+        cache_reader = FREDReader(
+            FRED_CONFIG['api_key'], cache=cache, offline=True, reporter=StreamlitReporter()
+        )
+        series_store = shared_store.refresh(lambda: load_series_store(cache_reader))
+        if series_store is not None:
+            st.session_state['series_store'] = series_store
+
+    if scheduler is not None:
+        show_refresh_controls(scheduler, offline)
+    elif st.button("Load/Refresh Data"):
+        fred_reader = FREDReader(
+            FRED_CONFIG['api_key'], cache=cache, offline=offline, reporter=StreamlitReporter()
+        )
         try:
             with st.spinner("Loading data from FRED..."):
-                category_data = fred_reader.load_all_categories(FRED_CONFIG)
-                if category_data:
-                    st.session_state['category_data'] = category_data
+                series_store = shared_store.refresh(lambda: load_series_store(fred_reader))
+                if series_store is not None:
+                    st.session_state['series_store'] = series_store
                     st.success("Data loaded successfully!")
                 else:
                     st.error("No data loaded")
+
+            with st.expander("Fetch Timings"):
+                show_fetch_report(fred_reader.request_report(), fred_reader.timing_report())
         except Exception as e:
             st.error(f"Error loading data: {str(e)}")
 
+    stats = cache.stats()
+    shared_stats = shared_store.stats()
+    figure_stats = get_figure_cache().stats()
+    st.caption(
+        f"Cache: {stats['hits']} hits, {stats['misses']} misses "
+        f"({stats['hit_rate']:.0%} hit rate) · "
+        f"Shared data: v{shared_stats['version']}, "
+        f"{shared_stats['memory_bytes'] / 1e6:.1f} MB, "
+        f"{shared_stats['hits']} session reads · "
+        f"Charts: {figure_stats['hits']} hits, {figure_stats['misses']} misses "
+        f"({figure_stats['hit_rate']:.0%} hit rate)"
+    )
+
     # Display data if available
-    if 'category_data' in st.session_state and st.session_state['category_data']:
-        # Create tabs for categories
+    if st.session_state.get('series_store') is not None:
+        series_store = st.session_state['series_store']
+        date_range = select_date_range(series_store)
+
+        with st.expander("Export all series"):
+            bulk_download(series_store)
+
+        # Only the selected category is computed and rendered; tabs would run them all
         categories = list(FRED_CONFIG['series'].keys())
-        tabs = st.tabs(categories)
-
-        # Display each category
-        for tab, category in zip(tabs, categories):
-            with tab:
-                if category in st.session_state['category_data']:
-                    show_category_data(
-                        st.session_state['category_data'][category],
-                        category
-                    )
-                else:
-                    st.warning(f"No data available for {category}")
\ No newline at end of file
+        category = st.radio("Category", categories, horizontal=True, key="viewer_category")
+
+        with timed_section(f"Data Viewer: {category}"):
+            if category in series_store.categories:
+                show_category_data(series_store, category, date_range)
+            else:
+                st.warning(f"No data available for {category}")
\ No newline at end of file
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data.cache import ObservationCache
+from data.fred_api import FREDReader
+from data.fred_stub import FREDStubServer
+from data.rate_limit import AdaptiveConcurrency, TokenBucket
+
+
+def monthly(start: float, periods: int = 36) -> pd.Series:
+    index = pd.date_range('2021-01-01', periods=periods, freq='MS')
+    return pd.Series([start + step for step in range(periods)], index=index, dtype=float)
+
+
+@pytest.fixture
+def history() -> pd.DataFrame:
+    """Quarterly corporate profits in the layout of DCF_CONFIG['inputs']"""
+    rng = np.random.default_rng(0)
+    index = pd.date_range('2000-01-01', periods=96, freq='QS')
+    before_tax = pd.Series(1000 * np.cumprod(1 + rng.normal(0.01, 0.03, len(index))), index=index)
+    return pd.DataFrame({
+        'Corporate Profits Before Tax': before_tax,
+        'Corporate Profits After Tax': before_tax * rng.uniform(0.75, 0.85, len(index))
+    })
+
+
+@pytest.fixture
+def stub():
+    with FREDStubServer({'AAA': monthly(1), 'BBB': monthly(100), 'CCC': monthly(1000)}) as server:
+        yield server
+
+
+@pytest.fixture
+def make_reader(stub, tmp_path):
+    """Readers against the stub with their own limits, so tests never wait on the shared ones"""
+    def make(cache: bool = True, **kwargs) -> FREDReader:
+        kwargs.setdefault('rate_limiter', TokenBucket(1e9, 10 ** 9))
+        kwargs.setdefault('concurrency', AdaptiveConcurrency(8))
+        return FREDReader(
+            'test', base_url=stub.base_url,
+            cache=ObservationCache(str(tmp_path / 'cache.sqlite')) if cache else None,
+            **kwargs
+        )
+    return make
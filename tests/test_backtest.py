@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+from models.backtest import _range_min
+
+
+def naive_range_min(values, starts, ends):
+    return np.array([values[start:end].min() if end > start else np.nan for start, end in zip(starts, ends)])
+
+
+@pytest.mark.parametrize('n', [1, 2, 7, 64, 1000])
+def test_range_min_matches_naive(n):
+    rng = np.random.default_rng(n)
+    values = rng.standard_normal(n)
+    starts = rng.integers(0, n + 1, size=500)
+    ends = np.minimum(starts + rng.integers(0, n + 1, size=500), n)
+    # Whole range, single points and empty windows are always included
+    starts = np.concatenate([starts, [0], np.arange(n), np.arange(n)])
+    ends = np.concatenate([ends, [n], np.arange(n) + 1, np.arange(n)])
+
+    np.testing.assert_array_equal(_range_min(values, starts, ends), naive_range_min(values, starts, ends))
+
+
+@pytest.mark.parametrize('window', [1, 3, 12, 50])
+def test_range_min_matches_rolling_min(window):
+    values = np.random.default_rng(window).standard_normal(300)
+    ends = np.arange(window, len(values) + 1)
+
+    result = _range_min(values, ends - window, ends)
+
+    expected = pd.Series(values).rolling(window).min().dropna().to_numpy()
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_range_min_of_empty_values():
+    result = _range_min(np.empty(0), np.array([0, 0]), np.array([0, 0]))
+
+    assert result.shape == (2,) and np.isnan(result).all()
@@ -0,0 +1,26 @@
+import pandas as pd
+from data.cache import ObservationCache
+from tests.conftest import monthly
+
+
+def test_empty_delta_keeps_cached_window(tmp_path):
+    cache = ObservationCache(str(tmp_path / 'cache.sqlite'))
+    cache.write('AAA', 'lin', monthly(1, periods=24))
+    since = pd.Timestamp('2022-01-01')
+
+    cache.merge('AAA', 'lin', None, since)
+    cache.merge('AAA', 'lin', monthly(1).iloc[:0], since)
+
+    assert len(cache.read('AAA', 'lin')) == 24
+
+
+def test_delta_replaces_cached_window(tmp_path):
+    cache = ObservationCache(str(tmp_path / 'cache.sqlite'))
+    cache.write('AAA', 'lin', monthly(1, periods=24))
+    since = pd.Timestamp('2022-01-01')
+
+    cache.merge('AAA', 'lin', monthly(100, periods=24).loc[since:].iloc[:3], since)
+
+    cached = cache.read('AAA', 'lin')
+    assert len(cached) == 15
+    assert cached.loc[since] == 112
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+from models.dcf_model import DCFEngine, DCFModel
+
+WACC, GROWTH, YEARS = 0.08, 0.02, 5
+
+
+def baseline_dcf(financial_data, wacc, terminal_growth, forecast_years):
+    """The original loop implementation, kept as the oracle for the closed form"""
+    historical_data = financial_data['Corporate Profits Before Tax']
+    avg_growth_rate = historical_data.pct_change().dropna().mean()
+    last_revenue = financial_data.iloc[-1]['Corporate Profits Before Tax']
+
+    forecast_df = pd.DataFrame(index=range(forecast_years))
+    forecast_df['Revenue'] = [last_revenue * (1 + avg_growth_rate) ** (i + 1) for i in range(forecast_years)]
+    tax_rate = 1 - (
+            financial_data['Corporate Profits After Tax'] / financial_data['Corporate Profits Before Tax']
+    ).mean()
+    forecast_df['Pre-Tax Income'] = forecast_df['Revenue']
+    forecast_df['Taxes'] = forecast_df['Pre-Tax Income'] * tax_rate
+    forecast_df['Net Income'] = forecast_df['Pre-Tax Income'] - forecast_df['Taxes']
+    forecast_df['FCF'] = forecast_df['Net Income']
+
+    final_fcf = forecast_df['FCF'].iloc[-1]
+    terminal_value = final_fcf * (1 + terminal_growth) / (wacc - terminal_growth)
+    present_values = [fcf / (1 + wacc) ** (i + 1) for i, fcf in enumerate(forecast_df['FCF'])]
+    terminal_value_pv = terminal_value / (1 + wacc) ** forecast_years
+    return {
+        'forecast': forecast_df,
+        'terminal_value': terminal_value,
+        'present_values': present_values,
+        'terminal_value_pv': terminal_value_pv,
+        'enterprise_value': sum(present_values) + terminal_value_pv
+    }
+
+
+def test_closed_form_matches_baseline(history):
+    result = DCFModel(history, WACC, GROWTH, YEARS).calculate_dcf()
+    expected = baseline_dcf(history, WACC, GROWTH, YEARS)
+
+    for key in ('terminal_value', 'terminal_value_pv', 'enterprise_value'):
+        assert result[key] == pytest.approx(expected[key], rel=1e-12), key
+    np.testing.assert_allclose(result['present_values'], expected['present_values'], rtol=1e-12)
+    np.testing.assert_allclose(result['forecast'].to_numpy(), expected['forecast'].to_numpy(), rtol=1e-12)
+
+
+def test_present_values_without_forecast(history):
+    result = DCFModel(history, WACC, GROWTH, YEARS).calculate_dcf(include_forecast=False)
+
+    assert 'forecast' not in result
+    np.testing.assert_allclose(
+        result['present_values'], baseline_dcf(history, WACC, GROWTH, YEARS)['present_values'], rtol=1e-12
+    )
+
+
+def test_growth_equal_to_wacc_uses_the_limit(history):
+    engine = DCFEngine(history)
+    wacc = engine.avg_growth_rate
+
+    result = engine.evaluate(wacc, GROWTH, YEARS)
+
+    assert float(result['pv_sum']) == pytest.approx(sum(baseline_dcf(history, wacc, GROWTH, YEARS)['present_values']))
+
+
+def test_sensitivity_grid_matches_baseline_loop(history):
+    # A wide spread makes part of the grid have WACC <= terminal growth
+    grid, wacc_range, growth_range = DCFModel(history, WACC, GROWTH, YEARS).sensitivity_analysis(
+        points=9, spread=0.06
+    )
+
+    invalid = wacc_range[:, np.newaxis] <= growth_range[np.newaxis, :]
+    assert invalid.any() and not invalid.all()
+    assert np.isnan(grid[invalid]).all()
+    for i, wacc in enumerate(wacc_range):
+        for j, growth in enumerate(growth_range):
+            if not invalid[i, j]:
+                expected = baseline_dcf(history, wacc, growth, YEARS)['enterprise_value']
+                assert grid[i, j] == pytest.approx(expected, rel=1e-10), (wacc, growth)
+
+
+def test_sensitivity_grid_over_forecast_years(history):
+    model = DCFModel(history, WACC, GROWTH, YEARS)
+    years = [3, 5, 10]
+
+    grid, wacc_range, growth_range = model.sensitivity_analysis(forecast_years_range=years)
+
+    assert grid.shape == (5, 5, 3)
+    for k, forecast_years in enumerate(years):
+        expected = baseline_dcf(history, wacc_range[0], growth_range[0], forecast_years)['enterprise_value']
+        assert grid[0, 0, k] == pytest.approx(expected, rel=1e-10)
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data.metrics import MetricGraph, get_metric_graph
+
+INPUTS = ['A', 'B', 'C']
+METRICS = {
+    'PRODUCT': {'formula': 'A * B'},
+    'SCALED': {'formula': 'PRODUCT / 1000 + sqrt(abs(C))'},
+    'RATIO': {'formula': 'A / C'},
+    'CONSTANT': {'formula': '2 ** 3'},
+}
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    index = pd.date_range('2020-01-01', periods=50, freq='MS')
+    df = pd.DataFrame(rng.standard_normal((50, 3)) * 10, index=index, columns=INPUTS)
+    df.iloc[3, 1] = np.nan
+    df.iloc[5, 2] = 0.0
+    return df
+
+
+def assert_same_columns(actual, expected):
+    assert actual.columns.keys() == expected.columns.keys()
+    for name in expected.columns:
+        np.testing.assert_array_equal(actual.columns[name], expected.columns[name])
+
+
+def test_configured_metrics_compile():
+    assert set(get_metric_graph().order) == set(get_metric_graph().metrics)
+
+
+def test_evaluation(frame):
+    values = MetricGraph(METRICS, INPUTS).evaluate(frame)
+
+    np.testing.assert_allclose(values.columns['PRODUCT'], frame['A'] * frame['B'])
+    np.testing.assert_allclose(
+        values.columns['SCALED'], frame['A'] * frame['B'] / 1000 + np.sqrt(np.abs(frame['C']))
+    )
+    # Division by zero is missing, not infinite
+    assert np.isnan(values.columns['RATIO'][5])
+    np.testing.assert_array_equal(values.columns['CONSTANT'], np.full(len(frame), 8.0))
+    assert set(values.join(frame).columns) == set(INPUTS) | set(METRICS)
+
+
+@pytest.mark.parametrize('formula, message', [
+    ('A +', 'invalid syntax'),
+    ('A.real', 'unsupported Attribute'),
+    ('__import__("os")', 'unsupported call'),
+    ('log(A, base=2)', 'unsupported call'),
+    ('A + "1"', 'unsupported constant'),
+    ('A if B else C', 'unsupported IfExp'),
+    ('A * D', 'unknown names D'),
+])
+def test_invalid_formulas_are_rejected(formula, message):
+    with pytest.raises(ValueError, match=message):
+        MetricGraph({'BAD': {'formula': formula}}, INPUTS)
+
+
+def test_every_problem_is_reported():
+    metrics = {
+        'not-an-id': {'formula': 'A'},
+        'A': {'formula': 'B'},
+        'UNKNOWN': {'formula': 'Z'},
+    }
+    with pytest.raises(ValueError) as error:
+        MetricGraph(metrics, INPUTS)
+
+    message = str(error.value)
+    assert 'not-an-id: metric keys must be identifiers' in message
+    assert 'A: metric key is also an input series' in message
+    assert 'UNKNOWN: unknown names Z' in message
+
+
+def test_cycles_are_rejected():
+    metrics = {
+        'X': {'formula': 'A + Z'},
+        'Y': {'formula': 'X * 2'},
+        'Z': {'formula': 'Y - 1'},
+    }
+    with pytest.raises(ValueError, match='circular formulas'):
+        MetricGraph(metrics, INPUTS)
+
+
+def test_incremental_matches_full_recompute(frame):
+    graph = MetricGraph(METRICS, INPUTS)
+    previous = graph.evaluate(frame)
+
+    changed = frame.copy()
+    changed.iloc[10, 2] += 1  # Only C changes
+
+    incremental = graph.evaluate(changed, previous)
+
+    assert_same_columns(incremental, graph.evaluate(changed))
+    # Metrics that do not depend on C are reused, not recomputed
+    assert incremental.columns['PRODUCT'] is previous.columns['PRODUCT']
+    assert incremental.columns['SCALED'] is not previous.columns['SCALED']
+    assert incremental.columns['RATIO'] is not previous.columns['RATIO']
+
+
+def test_incremental_with_a_new_index_recomputes_everything(frame):
+    graph = MetricGraph(METRICS, INPUTS)
+    previous = graph.evaluate(frame)
+
+    shorter = frame.iloc[:-1]
+    incremental = graph.evaluate(shorter, previous)
+
+    assert_same_columns(incremental, graph.evaluate(shorter))
+
+
+def test_missing_input_skips_its_dependents(frame):
+    graph = MetricGraph(METRICS, INPUTS)
+    previous = graph.evaluate(frame)
+
+    without_b = frame.drop(columns='B')
+    values = graph.evaluate(without_b, previous)
+
+    assert 'PRODUCT' not in values.columns and 'SCALED' not in values.columns
+    assert_same_columns(values, graph.evaluate(without_b))
+    # Adding the input back recomputes what was skipped
+    assert_same_columns(graph.evaluate(frame, values), graph.evaluate(frame))
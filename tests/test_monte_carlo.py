@@ -0,0 +1,51 @@
+import numpy as np
+from models.dcf_model import DCFEngine
+from models.monte_carlo import MonteCarloDCF
+
+WACC, GROWTH, YEARS = 0.08, 0.02, 5
+
+
+def test_same_seed_gives_same_result_with_workers(history):
+    simulation = MonteCarloDCF(history, WACC, GROWTH, YEARS)
+
+    serial = simulation.run(n_paths=25_000, chunk_size=4_000, seed=7)
+    pooled = simulation.run(n_paths=25_000, chunk_size=4_000, seed=7, workers=2)
+
+    np.testing.assert_array_equal(serial['enterprise_values'], pooled['enterprise_values'])
+    assert serial['percentiles'] == pooled['percentiles']
+    assert serial['rejected'] == pooled['rejected']
+    assert serial['convergence'].equals(pooled['convergence'])
+
+
+def test_different_seeds_differ(history):
+    simulation = MonteCarloDCF(history, WACC, GROWTH, YEARS)
+
+    first = simulation.run(n_paths=5_000, chunk_size=1_000, seed=1)
+    second = simulation.run(n_paths=5_000, chunk_size=1_000, seed=2)
+
+    assert first['mean'] != second['mean']
+
+
+def test_without_uncertainty_matches_closed_form(history):
+    engine = DCFEngine(history)
+    simulation = MonteCarloDCF(
+        history, WACC, GROWTH, YEARS, wacc_std=0, terminal_growth_std=0,
+        growth_mean=engine.avg_growth_rate, growth_std=0, engine=engine
+    )
+
+    result = simulation.run(n_paths=1_000, chunk_size=300, seed=0)
+
+    expected = float(engine.evaluate(WACC, GROWTH, YEARS)['enterprise_value'])
+    np.testing.assert_allclose(result['enterprise_values'], expected, rtol=1e-12)
+    assert result['rejected'] == 0
+    assert result['convergence']['paths'].iloc[-1] == 1_000
+
+
+def test_paths_with_wacc_below_growth_are_rejected(history):
+    result = MonteCarloDCF(
+        history, 0.03, 0.025, YEARS, wacc_std=0.02, terminal_growth_std=0.0
+    ).run(n_paths=10_000, chunk_size=2_500, seed=0)
+
+    assert 0 < result['rejected'] < 10_000
+    assert result['enterprise_values'].size == 10_000 - result['rejected']
+    assert not np.isnan(result['enterprise_values']).any()
@@ -0,0 +1,57 @@
+import pytest
+from datetime import datetime, timedelta
+from config.settings import FETCH_CONFIG
+from tests.conftest import monthly
+
+# A zero TTL makes every cached series stale, so each load runs the pre-flight check
+CONFIG = {'series': {'Test': {
+    series_id: {'name': series_id, 'units': 'lin', 'cache_ttl_hours': 0}
+    for series_id in ('AAA', 'BBB', 'CCC')
+}}}
+
+
+@pytest.fixture
+def primed(stub, make_reader):
+    """A cache holding every series and the last_updated stamps seen upstream"""
+    make_reader().load_all_series(CONFIG)  # First download
+    make_reader().load_all_series(CONFIG)  # Per-series checks record the stamps
+    stub.requests.clear()
+    return stub
+
+
+def observation_requests(stub) -> list:
+    return [params['series_id'] for path, params in stub.requests if path == '/series/observations']
+
+
+def test_unchanged_series_are_served_from_cache(primed, make_reader):
+    results = make_reader().load_all_series(CONFIG)
+
+    assert sorted(results) == ['AAA', 'BBB', 'CCC']
+    assert primed.request_paths() == ['/series/updates']
+    assert results['BBB'].iloc[-1] == 135
+
+
+def test_changed_series_are_refetched(primed, make_reader):
+    # Stamps have one-second resolution; make sure this one differs from the primed one
+    primed.update_series('BBB', monthly(200), updated_at=datetime.now() + timedelta(minutes=1))
+
+    results = make_reader().load_all_series(CONFIG)
+
+    assert observation_requests(primed) == ['BBB']
+    assert results['BBB'].iloc[-1] == 235
+    assert results['AAA'].iloc[-1] == 36
+
+
+def test_updates_listing_over_budget_falls_back_to_series_checks(primed, make_reader, monkeypatch):
+    monkeypatch.setitem(FETCH_CONFIG, 'updates_page_size', 1)
+    monkeypatch.setitem(FETCH_CONFIG, 'updates_max_pages', 2)
+
+    results = make_reader().load_all_series(CONFIG)
+
+    paths = primed.request_paths()
+    assert paths.count('/series/updates') == 1
+    assert sorted(params['series_id'] for path, params in primed.requests if path == '/series') == [
+        'AAA', 'BBB', 'CCC'
+    ]
+    assert observation_requests(primed) == []
+    assert sorted(results) == ['AAA', 'BBB', 'CCC']
@@ -0,0 +1,102 @@
+import pytest
+import requests
+import data.fred_api
+from data.rate_limit import AdaptiveConcurrency, backoff_delay
+
+
+@pytest.fixture
+def delays(monkeypatch):
+    """Record (retry_after, delay) of every backoff, with a tiny exponential step"""
+    recorded = []
+
+    def fast_backoff(attempt, retry_after=None):
+        delay = backoff_delay(attempt, base=0.001, cap=1.0, retry_after=retry_after)
+        recorded.append((retry_after, delay))
+        return delay
+
+    monkeypatch.setattr(data.fred_api, 'backoff_delay', fast_backoff)
+    return recorded
+
+
+def test_server_errors_are_retried_until_success(stub, make_reader, delays):
+    stub.set_faults(error_rate=0.5)
+    reader = make_reader(cache=False, max_retries=20)
+
+    for _ in range(10):
+        assert reader.fetch_last_updated('AAA') is not None
+
+    report = reader.request_report()
+    assert stub.injected['errors'] > 0
+    assert report['server_errors'] == report['retries'] == stub.injected['errors']
+    assert report['successes'] == 10
+    assert report['failures'] == 0
+
+
+def test_retries_give_up_after_max_retries(stub, make_reader, delays):
+    stub.set_faults(error_rate=1.0)
+    reader = make_reader(cache=False, max_retries=3)
+
+    with pytest.raises(requests.HTTPError):
+        reader.fetch_last_updated('AAA')
+
+    report = reader.request_report()
+    assert report['requests'] == 4
+    assert report['retries'] == 3
+    assert report['failures'] == 1
+
+
+def test_retry_after_is_honoured(stub, make_reader, delays):
+    stub.set_faults(throttle_rate=1.0, retry_after=0.2)
+    reader = make_reader(cache=False, max_retries=2)
+
+    with pytest.raises(requests.HTTPError):
+        reader.fetch_last_updated('AAA')
+
+    assert reader.request_report()['throttled'] == 3
+    assert len(delays) == 2
+    for retry_after, delay in delays:
+        assert retry_after == 0.2
+        assert delay >= 0.2
+
+
+def test_timeouts_are_retried(stub, make_reader, delays):
+    stub.set_faults(stall_rate=1.0, stall_seconds=0.5)
+    reader = make_reader(cache=False, max_retries=2)
+    reader.timeout = (1, 0.1)
+
+    with pytest.raises(requests.Timeout):
+        reader.fetch_last_updated('AAA')
+    assert reader.request_report()['timeouts'] == 3
+
+    stub.set_faults(stall_rate=0.0)
+    assert reader.fetch_last_updated('AAA') is not None
+
+
+def test_concurrency_shrinks_on_throttling_and_recovers(stub, make_reader, delays):
+    concurrency = AdaptiveConcurrency(8, increase_after=2)
+    reader = make_reader(cache=False, max_retries=3, concurrency=concurrency)
+
+    stub.set_faults(throttle_rate=1.0, retry_after=0.0)
+    with pytest.raises(requests.HTTPError):
+        reader.fetch_last_updated('AAA')
+    # Halved on each of the four 429s: 8 -> 4 -> 2 -> 1 -> 1
+    assert concurrency.limit == 1
+    assert reader.request_report()['concurrency_min'] == 1
+
+    stub.set_faults(throttle_rate=0.0)
+    for _ in range(7 * 2):
+        reader.fetch_last_updated('AAA')
+    assert concurrency.limit == 8
+
+
+def test_server_rate_limit_is_absorbed_by_retries(stub, make_reader, delays):
+    stub.set_faults(requests_per_second=5, retry_after=0.1)
+    reader = make_reader(cache=False, max_retries=20)
+
+    for _ in range(15):
+        assert reader.fetch_last_updated('AAA') is not None
+
+    report = reader.request_report()
+    assert stub.injected['throttled'] > 0
+    assert report['throttled'] == report['retries'] == stub.injected['throttled']
+    assert report['successes'] == 15
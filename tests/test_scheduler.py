@@ -0,0 +1,37 @@
+import pytest
+from data.cache import ObservationCache
+from data.scheduler import RefreshScheduler
+from data.shared_store import SharedDataStore
+from tests.test_preflight import CONFIG
+
+
+@pytest.fixture
+def scheduler(stub, tmp_path):
+    """A scheduler that has published every series once"""
+    scheduler = RefreshScheduler(
+        SharedDataStore(), ObservationCache(str(tmp_path / 'cache.sqlite')), config=CONFIG,
+        base_url=stub.base_url, lock_path=None
+    )
+    assert sorted(scheduler.run_once()) == ['AAA', 'BBB', 'CCC']
+    stub.requests.clear()
+    return scheduler
+
+
+def test_offline_scheduler_makes_no_requests(scheduler, stub):
+    scheduler.set_offline(True)
+    scheduler.request_refresh()
+
+    assert scheduler.run_once() == []
+    assert stub.requests == []
+    assert scheduler.status()['offline']
+
+
+def test_forced_refresh_resumes_when_back_online(scheduler, stub):
+    scheduler.set_offline(True)
+    scheduler.request_refresh()
+    scheduler.run_once()
+    scheduler.set_offline(False)
+
+    scheduler.run_once()
+
+    assert stub.request_paths()
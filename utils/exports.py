@@ -0,0 +1,191 @@
+import io
+import threading
+import zipfile
+from collections import OrderedDict
+from typing import Callable, Hashable
+import numpy as np
+import pandas as pd
+import streamlit as st
+from config.settings import EXPORT_CONFIG, FRED_CONFIG
+from data.series_store import SeriesStore
+from utils.figure_cache import data_fingerprint
+from utils.tracing import span
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Bulk export falls back to a zip of CSVs
+    pa = None
+    pq = None
+
+
+class ExportCache:
+    """Process-wide LRU cache of generated export files, bounded by size in bytes"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key: Hashable, build: Callable[[], bytes]) -> bytes:
+        """Cached bytes for `key`, generated with `build` on a miss"""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+            self.misses += 1
+
+        data = build()
+        if len(data) > self.max_bytes:
+            return data
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = data
+                self._bytes += len(data)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+        return data
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+_export_cache = ExportCache(EXPORT_CONFIG['cache_mb'] * 1024 * 1024)
+
+
+def get_export_cache() -> ExportCache:
+    """The export cache shared by every session in this process"""
+    return _export_cache
+
+
+def _to_csv(series: pd.Series) -> bytes:
+    with span('export.to_csv', series_id=series.name, rows=len(series)):
+        return series.to_csv().encode()
+
+
+def series_csv(series: pd.Series) -> bytes:
+    """CSV export of one series, cached by its data fingerprint"""
+    return get_export_cache().get_or_build(
+        (series.name, data_fingerprint(series), 'csv'),
+        lambda: _to_csv(series)
+    )
+
+
+def write_csv_zip(series_store: SeriesStore, handle):
+    """Write one CSV per series into a zip archive, one series at a time"""
+    with zipfile.ZipFile(handle, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for series_id in series_store.series_ids:
+            with archive.open(f"{series_id}.csv", 'w') as member:
+                with io.TextIOWrapper(member, encoding='utf-8', newline='') as text:
+                    series_store.series(series_id).to_csv(text)
+
+
+def write_parquet(series_store: SeriesStore, handle):
+    """Write every observation as a (series_id, date, value) row of one Parquet file.
+
+    Rows come straight from the store's native-frequency arrays, one row
+    group of EXPORT_CONFIG['parquet_row_group'] observations at a time.
+    """
+    names = {
+        series_id: info['name']
+        for series_dict in FRED_CONFIG['series'].values()
+        for series_id, info in series_dict.items()
+    }
+    schema = pa.schema(
+        [
+            pa.field('series_id', pa.dictionary(pa.int32(), pa.string())),
+            pa.field('date', pa.timestamp('ns')),
+            pa.field('value', pa.float64())
+        ],
+        metadata={
+            series_id: names.get(series_id, series_id) for series_id in series_store.series_ids
+        }
+    )
+    dictionary = pa.array(series_store.series_ids, type=pa.string())
+    rows = np.repeat(
+        np.arange(len(series_store.series_ids), dtype=np.int32), np.diff(series_store.offsets)
+    )
+
+    chunk = EXPORT_CONFIG['parquet_row_group']
+    with pq.ParquetWriter(handle, schema) as writer:
+        for start in range(0, len(series_store.dates), chunk):
+            end = start + chunk
+            writer.write_table(pa.Table.from_arrays([
+                pa.DictionaryArray.from_arrays(pa.array(rows[start:end]), dictionary),
+                pa.array(series_store.dates[start:end]),
+                pa.array(series_store.values[start:end].astype(np.float64, copy=False))
+            ], schema=schema))
+
+
+def bulk_export(series_store: SeriesStore, file_format: str) -> bytes:
+    """All series as one 'parquet' or 'zip' file, cached by the store's fingerprint"""
+    def build():
+        with span('export.bulk', format=file_format):
+            buffer = io.BytesIO()
+            if file_format == 'parquet':
+                write_parquet(series_store, buffer)
+            else:
+                write_csv_zip(series_store, buffer)
+            return buffer.getvalue()
+
+    fingerprint = series_store.fingerprint()
+    return get_export_cache().get_or_build(('__all__', fingerprint, file_format), build)
+
+
+def bulk_formats() -> list:
+    """Bulk export formats available in this environment"""
+    return ['parquet', 'zip'] if pq is not None else ['zip']
+
+
+def _requested(container, label: str, key: str) -> bool:
+    """Whether the user asked for an export; stays True for the rest of the session.
+
+    Keeping the download button on later reruns keeps its file registered
+    until the browser has fetched it.
+    """
+    requested = st.session_state.setdefault('requested_exports', set())
+    if key not in requested and container.button(label, key=f"{key}_prepare"):
+        requested.add(key)
+    return key in requested
+
+
+def csv_download(container, series_store: SeriesStore, series_id: str, label: str, key: str):
+    """Download button for a series' CSV, generated only after the user asks for it"""
+    if _requested(container, f"Prepare {label} CSV", key):
+        container.download_button(
+            label=f"Download {label} Data (CSV)",
+            data=series_csv(series_store.series(series_id)),
+            file_name=f"{label.replace(' ', '_').lower()}_data.csv",
+            mime="text/csv",
+            key=key
+        )
+
+
+def bulk_download(series_store: SeriesStore):
+    """Format picker and button exporting every loaded series at once"""
+    file_format = st.selectbox(
+        "Export format", bulk_formats(),
+        format_func=lambda fmt: {'parquet': 'Parquet', 'zip': 'Zip of CSVs'}[fmt]
+    )
+    if _requested(st, "Prepare export of all series", f"bulk_{file_format}"):
+        data = bulk_export(series_store, file_format)
+        st.download_button(
+            label=f"Download all series ({len(data) / 1e6:.1f} MB)",
+            data=data,
+            file_name=f"fred_series.{file_format}",
+            mime="application/vnd.apache.parquet" if file_format == 'parquet' else "application/zip",
+            key=f"bulk_{file_format}"
+        )
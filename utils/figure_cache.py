@@ -0,0 +1,95 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+from config.settings import DISPLAY_CONFIG
+from utils.tracing import span
+
+
+def data_fingerprint(series: pd.Series) -> str:
+    """Digest of a series' dates and values; equal data gives an equal fingerprint"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(series.index.values.astype('datetime64[ns]')).tobytes())
+    digest.update(np.ascontiguousarray(series.to_numpy(dtype=float)).tobytes())
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """Process-wide LRU cache of Plotly figures, bounded by serialized size.
+
+    Keys are (series_id, data fingerprint, layout params), so a rerun with
+    unchanged data and layout reuses the figure instead of rebuilding it,
+    and refreshed data that did not change keeps its entries. Each entry
+    is charged the length of its JSON spec against the memory limit.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (figure, spec bytes)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key: Hashable, build: Callable[[], go.Figure]) -> go.Figure:
+        """Cached figure for `key`, built with `build` on a miss.
+
+        The figure is kept built rather than as a spec dict: st.plotly_chart
+        re-validates dicts through go.Figure, which would undo the saving.
+        Cached figures are shared between sessions and must not be modified.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        with span('figure.build'):
+            figure = build()
+        with span('figure.size'):
+            size = len(pio.to_json(figure, validate=False))
+        if size > self.max_bytes:
+            return figure
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (figure, size)
+                self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+        return figure
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Entry count, memory use and hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+_figure_cache = FigureCache(DISPLAY_CONFIG['figure_cache_mb'] * 1024 * 1024)
+
+
+def get_figure_cache() -> FigureCache:
+    """The figure cache shared by every session in this process"""
+    return _figure_cache
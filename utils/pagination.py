@@ -0,0 +1,18 @@
+import math
+from typing import List
+import streamlit as st
+
+
+def paginate(items: List, per_page: int, key: str) -> List:
+    """Items on the page chosen with a page selector; the selector is hidden for one page"""
+    n_pages = max(math.ceil(len(items) / per_page), 1)
+    if n_pages == 1:
+        return items
+
+    page = st.number_input(
+        f"Page (1–{n_pages})", min_value=1, max_value=n_pages, value=1, step=1,
+        key=f"{key}_of_{n_pages}"  # A new key when the page count changes keeps the value in range
+    )
+    start = (page - 1) * per_page
+    st.caption(f"Showing {start + 1}–{min(start + per_page, len(items))} of {len(items)}")
+    return items[start:start + per_page]
@@ -0,0 +1,69 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+logger = logging.getLogger('hospitality')
+
+
+class Reporter:
+    """Progress and error callbacks for data loading and model runs.
+
+    The base class writes to the `hospitality` logger, so readers and models
+    run the same way from the CLI, cron jobs or worker processes. Pages pass
+    a StreamlitReporter to show the messages in the app instead.
+    """
+
+    def __init__(self, log: Optional[logging.Logger] = None):
+        self.log = log or logger
+
+    def info(self, message: str):
+        self.log.info(message)
+
+    def success(self, message: str):
+        self.log.info(message)
+
+    def warning(self, message: str):
+        self.log.warning(message)
+
+    def error(self, message: str):
+        self.log.error(message)
+
+    @contextmanager
+    def step(self, message: str):
+        """Report a long-running step and how long it took"""
+        start = time.perf_counter()
+        self.log.info(message)
+        try:
+            yield
+        finally:
+            self.log.info("%s took %.2f s", message, time.perf_counter() - start)
+
+
+class StreamlitReporter(Reporter):
+    """Shows messages in the running page, with a spinner for each step"""
+
+    def __init__(self, container=None, log: Optional[logging.Logger] = None):
+        super().__init__(log)
+        import streamlit as st
+        self.st = st
+        self.container = container or st
+
+    def info(self, message: str):
+        self.container.info(message)
+
+    def success(self, message: str):
+        self.container.success(message)
+
+    def warning(self, message: str):
+        super().warning(message)
+        self.container.warning(message)
+
+    def error(self, message: str):
+        super().error(message)
+        self.container.error(message)
+
+    @contextmanager
+    def step(self, message: str):
+        with self.st.spinner(f"{message}..."):
+            yield
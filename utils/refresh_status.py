@@ -0,0 +1,41 @@
+import time
+from typing import Optional
+import streamlit as st
+from config.settings import REFRESH_CONFIG
+from data.scheduler import RefreshScheduler
+from data.shared_store import SharedDataStore
+
+
+def _ago(stamp: Optional[float]) -> str:
+    if stamp is None:
+        return "never"
+    minutes = (time.time() - stamp) / 60
+    if minutes < 1:
+        return "just now"
+    if minutes < 120:
+        return f"{minutes:.0f} min ago"
+    return f"{minutes / 60:.1f} h ago"
+
+
+@st.fragment(run_every=REFRESH_CONFIG['status_poll_seconds'])
+def show_refresh_status(scheduler: RefreshScheduler, shared_store: SharedDataStore):
+    """Sidebar staleness indicator; reruns the page when newer data has been published"""
+    shared_store.sync()
+    if shared_store.version > st.session_state.get('store_version', 0):
+        st.rerun()
+
+    # Read from the scheduler's per-tick snapshot; polling sessions never touch the cache
+    status = scheduler.status()
+    stale = status['stale']
+    if shared_store.series_store is None:
+        st.info("Loading data in the background...")
+    st.caption(
+        f"Data published {_ago(shared_store.loaded_at)} · "
+        f"last refresh check {_ago(status['last_run'])}"
+    )
+    if status['offline']:
+        st.caption("Offline: background refresh paused")
+    if stale:
+        st.warning(f"{stale} series stale")
+    if status['errors']:
+        st.caption(f"{status['errors']} series failed last refresh; retrying")
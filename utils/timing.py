@@ -0,0 +1,57 @@
+import time
+from contextlib import contextmanager
+import pandas as pd
+import streamlit as st
+from utils.tracing import Trace, span
+
+SESSION_KEY = 'section_timings'
+
+
+def reset_section_timings():
+    """Start a new run's timings; call once at the top of the script"""
+    st.session_state[SESSION_KEY] = {}
+
+
+@contextmanager
+def timed_section(name: str):
+    """Record the wall time of a rendering section for the current run"""
+    start = time.perf_counter()
+    try:
+        with span(name):
+            yield
+    finally:
+        timings = st.session_state.setdefault(SESSION_KEY, {})
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+
+def section_timings() -> pd.DataFrame:
+    """Timings recorded so far in this run, slowest first"""
+    timings = st.session_state.get(SESSION_KEY, {})
+    return pd.DataFrame(
+        {'seconds': list(timings.values())},
+        index=pd.Index(list(timings.keys()), name='section')
+    ).sort_values('seconds', ascending=False)
+
+
+def show_section_timings():
+    """Sidebar table of this run's section timings"""
+    with st.sidebar.expander("Render timings"):
+        st.dataframe(section_timings().style.format("{:.3f}"))
+
+
+def show_profile_panel(trace: Trace):
+    """Sidebar breakdown of a profiled run's spans, with JSON and Chrome trace downloads"""
+    with st.sidebar.expander("Profile"):
+        st.caption(
+            f"{trace.name}: {len(trace.spans)} spans in {trace.duration:.3f} s"
+            + (f", {trace.dropped} dropped" if trace.dropped else "")
+        )
+        st.dataframe(trace.summary().style.format("{:.3f}", subset=['total', 'mean', 'max']))
+        st.download_button(
+            "Download trace (JSON)", trace.to_json(), file_name='trace.json', mime='application/json'
+        )
+        st.download_button(
+            "Download Chrome trace", trace.to_json(chrome=True),
+            file_name='trace.chrome.json', mime='application/json',
+            help="Open in chrome://tracing or ui.perfetto.dev"
+        )
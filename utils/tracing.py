@@ -0,0 +1,190 @@
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+import pandas as pd
+from config.settings import PROFILE_CONFIG
+
+# The trace being recorded in this context (a script run, a CLI run), if any
+_current_trace: contextvars.ContextVar = contextvars.ContextVar('trace', default=None)
+_current_span: contextvars.ContextVar = contextvars.ContextVar('span', default=None)
+
+
+class _NullSpan:
+    """Returned by `span` when nothing is being traced; entering it does nothing"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **attributes):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ('trace', 'name', 'attributes', 'start', 'duration', 'thread', 'parent', 'index', '_token')
+
+    def __init__(self, trace: 'Trace', name: str, attributes: dict):
+        self.trace = trace
+        self.name = name
+        self.attributes = attributes
+        self.start = 0.0
+        self.duration = 0.0
+        self.thread = 0
+        self.parent: Optional[int] = None
+        self.index = -1
+
+    def set(self, **attributes):
+        """Attach attributes known only once the work is done (sizes, cache hits)"""
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> 'Span':
+        parent = _current_span.get()
+        self.parent = parent.index if parent is not None and parent.trace is self.trace else None
+        self.thread = threading.get_ident()
+        self._token = _current_span.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self.start
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.attributes['error'] = exc_type.__name__
+        self.trace.record(self)
+        return False
+
+
+class Trace:
+    """Spans recorded during one run, from any thread working on its behalf.
+
+    Spans are kept in completion order with their parent's index, up to
+    PROFILE_CONFIG['max_spans'] per trace.
+    """
+
+    def __init__(self, name: str, max_spans: int = PROFILE_CONFIG['max_spans']):
+        self.name = name
+        self.max_spans = max_spans
+        self.started_at = time.time()
+        self.origin = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.spans: List[Span] = []
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def record(self, span: Span):
+        with self._lock:
+            if len(self.spans) >= self.max_spans:
+                self.dropped += 1
+                return
+            span.index = len(self.spans)
+            self.spans.append(span)
+
+    def summary(self) -> pd.DataFrame:
+        """Count, total, mean and max seconds per span name, largest total first"""
+        frame = pd.DataFrame(
+            {'span': [span.name for span in self.spans], 'seconds': [span.duration for span in self.spans]}
+        )
+        if frame.empty:
+            return pd.DataFrame(columns=['count', 'total', 'mean', 'max'])
+        summary = frame.groupby('span')['seconds'].agg(['count', 'sum', 'mean', 'max'])
+        return summary.rename(columns={'sum': 'total'}).sort_values('total', ascending=False)
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'started_at': self.started_at,
+            'duration': self.duration,
+            'dropped': self.dropped,
+            'spans': [
+                {
+                    'name': span.name,
+                    'start': span.start - self.origin,
+                    'duration': span.duration,
+                    'thread': span.thread,
+                    'parent': span.parent,
+                    'attributes': span.attributes
+                }
+                for span in self.spans
+            ]
+        }
+
+    def to_chrome_trace(self) -> Dict:
+        """Trace Event Format, for chrome://tracing or ui.perfetto.dev"""
+        pid = os.getpid()
+        events = [
+            {
+                'name': span.name,
+                'ph': 'X',
+                'ts': (span.start - self.origin) * 1e6,
+                'dur': span.duration * 1e6,
+                'pid': pid,
+                'tid': span.thread,
+                'args': span.attributes
+            }
+            for span in self.spans
+        ]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms', 'otherData': {'name': self.name}}
+
+    def to_json(self, chrome: bool = False) -> str:
+        return json.dumps(self.to_chrome_trace() if chrome else self.to_dict(), default=str)
+
+
+@contextmanager
+def start_trace(name: str, enabled: bool = True):
+    """Record spans opened in this context until the block exits; yields the Trace (or None)"""
+    if not enabled:
+        yield None
+        return
+    trace = Trace(name)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(None)
+    try:
+        yield trace
+    finally:
+        trace.duration = time.perf_counter() - trace.origin
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+
+
+def span(name: str, **attributes):
+    """Time a block as part of the current trace; a shared no-op when nothing is traced"""
+    trace = _current_trace.get()
+    if trace is None:
+        return _NULL_SPAN
+    return Span(trace, name, attributes)
+
+
+def traced(name: str) -> Callable:
+    """Decorator form of `span`"""
+    def decorate(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _current_trace.get() is None:
+                return function(*args, **kwargs)
+            with Span(_current_trace.get(), name, {}):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def propagate(function: Callable) -> Callable:
+    """Run `function` in the caller's trace context, e.g. from a thread pool worker"""
+    if _current_trace.get() is None:
+        return function
+    context = contextvars.copy_context()
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        # A context can only be entered by one thread at a time; give each call its own copy
+        return context.copy().run(function, *args, **kwargs)
+    return wrapper